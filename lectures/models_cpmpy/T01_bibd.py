@@ -16,8 +16,6 @@ model = cp.Model(
     [cp.sum(row_i*row_j) == balance for row_i, row_j in all_pairs(BIBD)]
 )
 
-model.solve()
-
 # in lecture: print the first constraint
 print("The first (list of) constraint:",[cp.sum(row) == sampleSize for row in BIBD])
 
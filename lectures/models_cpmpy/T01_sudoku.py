@@ -24,7 +24,6 @@ model = cp.Model(
         for i in range(0, 9, 3) for j in range(0, 9, 3)],
     grid[given!=0] == given[given!=0],  # enforce the hints
 )
-model.solve()
 
 # Solve and print
 if model.solve():
@@ -1,5 +1,6 @@
 import cpmpy as cp
-m = cp.Model()
+from incremental import IncrementalModel
+m = IncrementalModel()  # re-solves only post the new constraints and objective
 X = cp.intvar(1,9, shape=10)
 b = 9
 m.add(cp.sum(X) >= 25)
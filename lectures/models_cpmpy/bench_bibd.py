@@ -0,0 +1,28 @@
+import time
+
+import pandas as pd
+import cpmpy as cp
+
+from instances import bibd, bibd_vectorised
+
+# (v, b, r, k, lambda) of known designs, up to v = 25
+instances = [(7, 7, 3, 3, 1), (13, 13, 4, 4, 1), (16, 16, 6, 6, 2), (21, 21, 5, 5, 1), (25, 30, 6, 5, 1)]
+builders = dict(comprehension=bibd, vectorised=bibd_vectorised,
+                double_lex=lambda *args: bibd_vectorised(*args, double_lex=True))
+time_limit = 10
+
+if __name__ == "__main__":
+    rows = []
+    for args in instances:
+        for name, builder in builders.items():
+            t0 = time.perf_counter()
+            model, BIBD = builder(*args)
+            t1 = time.perf_counter()
+            s = cp.SolverLookup.get("ortools", model)  # posting transforms the model for the solver
+            t2 = time.perf_counter()
+            s.solve(time_limit=time_limit)
+            rows.append(dict(instance=str(args), builder=name, build=t1 - t0, transform=t2 - t1,
+                             solve=time.perf_counter() - t2, status=s.status().exitstatus.name))
+
+    pd.set_option("display.width", 200)
+    print(pd.DataFrame(rows).to_string(index=False))
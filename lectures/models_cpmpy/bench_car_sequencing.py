@@ -0,0 +1,37 @@
+import io
+import time
+
+import cpmpy as cp
+from car_sequencing import model_car_sequence, model_car_sequence_table, read_csplib
+from instances import car_sequencing_data
+
+sizes = [20, 50]  # number of cars, e.g. [100, 200, 400] for realistic instances
+time_limit = 5
+
+# the example instance of CSPLib prob001, in the CSPLib file format
+example = """# CSPLib example: 10 cars, 5 options, 6 classes
+10 5 6
+1 2 1 2 1
+2 3 3 5 5
+0 1 1 0 1 1 0
+1 1 0 0 0 1 0
+2 2 0 1 0 0 1
+3 2 0 1 0 1 0
+4 2 1 0 1 0 0
+5 2 1 1 0 0 0
+"""
+
+data = {"csplib-example": next(read_csplib(io.StringIO(example)))}
+data.update({f"random-{n}": car_sequencing_data(n) for n in sizes})
+
+for name, instance in data.items():
+    for builder in (model_car_sequence, model_car_sequence_table):
+        t0 = time.perf_counter()
+        model, (sequence, option) = builder(*instance)
+        t1 = time.perf_counter()
+        s = cp.SolverLookup.get("ortools", model)
+        t2 = time.perf_counter()
+        s.solve(time_limit=time_limit)
+        t3 = time.perf_counter()
+        print(f"{name:16s} {builder.__name__:26s} build {t1 - t0:6.3f}s  transform {t2 - t1:6.3f}s  "
+              f"solve {t3 - t2:6.3f}s  {s.status().exitstatus.name}")
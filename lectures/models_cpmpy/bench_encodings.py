@@ -0,0 +1,48 @@
+import time
+
+import pandas as pd
+import cpmpy as cp
+
+from instances import sudoku, nqueens, bibd
+from sat_encoding import CNF
+from sudoku_batch import parse
+
+# the Sudoku of T01_sudoku.py
+hardest = "800000000003600000070090200050007000000450700000100030001000068008500010090000400"
+instances = {
+    "sudoku": lambda: sudoku(parse(hardest)),
+    "nqueens 16": lambda: nqueens(16),
+    "nqueens 48": lambda: nqueens(48),
+    "bibd (9,12,4,3,1)": lambda: bibd(9, 12, 4, 3, 1),
+    "bibd (13,13,4,4,1)": lambda: bibd(13, 13, 4, 4, 1),
+}
+# cpmpy's pysat interface linearises AllDifferent: from 24 queens on it needs minutes and gigabytes
+no_reference = {"nqueens 48"}
+backend = "glucose4"
+time_limit = 30
+
+if __name__ == "__main__":
+    rows = []
+    for name, build in instances.items():
+        for encoding in ["direct", "order", "log", "auto"]:
+            model, _ = build()
+            t0 = time.perf_counter()
+            cnf = CNF(model, encoding)
+            t1 = time.perf_counter()
+            cnf.solve(backend, time_limit)
+            rows.append(dict(model=name, encoding=encoding, variables=cnf.pool.top, clauses=len(cnf.clauses),
+                             build=t1 - t0, solve=time.perf_counter() - t1, status=cnf.status().exitstatus.name))
+        if name in no_reference:
+            continue
+        # for reference: cpmpy's own SAT encoding (int2bool) in its pysat interface
+        model, _ = build()
+        t0 = time.perf_counter()
+        s = cp.SolverLookup.get("pysat:" + backend, model)
+        t1 = time.perf_counter()
+        s.solve(time_limit=time_limit)
+        rows.append(dict(model=name, encoding="cpmpy pysat", variables=s.pysat_vpool.top,
+                         clauses=s.pysat_solver.nof_clauses(), build=t1 - t0, solve=time.perf_counter() - t1,
+                         status=s.status().exitstatus.name))
+
+    pd.set_option("display.width", 200)
+    print(pd.DataFrame(rows).to_string(index=False))
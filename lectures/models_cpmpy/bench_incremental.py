@@ -0,0 +1,51 @@
+import time
+
+import pandas as pd
+import cpmpy as cp
+
+from incremental import IncrementalModel
+from instances import bibd, doctor
+
+# repeated solves of a growing model: plain cp.Model re-transforms everything on every solve(),
+# IncrementalModel only posts the delta to the solver it kept
+
+
+def double_solve(cls):
+    # solve() to check, and solve() again to print, as in the lecture scripts
+    model, BIBD = bibd(13, 13, 4, 4, 1)
+    model = cls(model.constraints)
+    model.solve()
+    return model.solve()
+
+
+def objective_swap(cls):
+    # the same constraints, minimised and then maximised on another objective (as T02_division.py)
+    model, roster = doctor(4)
+    model = cls(model.constraints)
+    for objective in [cp.sum(roster[0]), cp.sum(roster[1]), cp.sum(roster[:, 0])]:
+        model.minimize(objective)
+        model.solve(time_limit=5)
+        model.maximize(objective)
+        model.solve(time_limit=5)
+    return model.objective_value()
+
+
+def growing(cls):
+    # fix the cells of the first rows one at a time, to the value of the previous solution
+    model, BIBD = bibd(13, 13, 4, 4, 1)
+    model = cls(model.constraints)
+    for x in BIBD[:2].flat:
+        model.solve()
+        model.add(x == x.value())
+    return model.solve()
+
+
+if __name__ == "__main__":
+    rows = []
+    for name, scenario in [("double solve", double_solve), ("objective swap", objective_swap), ("growing", growing)]:
+        for cls in [cp.Model, IncrementalModel]:
+            t0 = time.perf_counter()
+            result = scenario(cls)
+            rows.append(dict(scenario=name, model=cls.__name__, time=time.perf_counter() - t0, result=result))
+
+    print(pd.DataFrame(rows).to_string(index=False))
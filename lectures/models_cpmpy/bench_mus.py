@@ -0,0 +1,29 @@
+import time
+import numpy as np
+
+import cpmpy as cp
+from mus_naive import mus_naive
+from mus_assump import mus_assump, quickxplain_assump
+
+sizes = [10, 20, 40]  # number of constraints, increase for a real benchmark
+
+
+def unsat_instance(n, seed=0):
+    # a small conflict hidden among many satisfiable constraints
+    rng = np.random.default_rng(seed)
+    X = cp.intvar(0, 10, shape=n, name="X")
+    cons = [X[i] != X[j] for i, j in rng.integers(0, n, size=(n - 3, 2)) if i != j]
+    cons += [X[0] + X[1] >= 15, X[0] <= 4, X[1] <= 9]
+    rng.shuffle(cons)
+    return cons
+
+
+for n in sizes:
+    cons = unsat_instance(n)
+    line = f"n={len(cons):4d}"
+    for func in (mus_naive, mus_assump, quickxplain_assump):
+        t0 = time.perf_counter()
+        core = func(cons)
+        line += f"  {func.__name__}: {time.perf_counter() - t0:.3f}s (|mus|={len(core)})"
+        assert cp.Model(core).solve() is False
+    print(line)
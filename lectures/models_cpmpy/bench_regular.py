@@ -0,0 +1,41 @@
+import time
+
+import pandas as pd
+import cpmpy as cp
+
+import instances
+from regular import regex_dfa, regular
+
+# "free after oper" in the doctor roster (T01_doctor.py) over long horizons: written as one implication
+# per doctor and day, or as a regular constraint per doctor in each of its forms
+free_after_oper = regex_dfa("([^O]|OF)*O?", "ACOF")
+time_limit = 10
+
+
+def doctor(n_weeks, form, solver):
+    model, roster = instances.doctor(n_weeks, free_after_oper=(form == "implications"))
+    if form != "implications":
+        model.add(regular(roster, free_after_oper, solver, form))
+    if solver != "ortools":  # pysat can not optimise
+        model = cp.Model(model.constraints)
+    return model
+
+
+if __name__ == "__main__":
+    rows = []
+    for n_weeks in [4, 13, 52]:
+        for solver, forms in [("ortools", ["implications", "regular", "table", "layered"]),
+                              ("pysat", ["implications", "layered"])]:
+            for form in forms:
+                t0 = time.perf_counter()
+                model = doctor(n_weeks, form, solver)
+                t1 = time.perf_counter()
+                s = cp.SolverLookup.get(solver, model)
+                t2 = time.perf_counter()
+                s.solve(time_limit=time_limit)
+                rows.append(dict(weeks=n_weeks, solver=solver, form=form, build=t1 - t0, transform=t2 - t1,
+                                 solve=time.perf_counter() - t2, status=s.status().exitstatus.name,
+                                 objective=s.objective_value() if solver == "ortools" else None))
+
+    pd.set_option("display.width", 200)
+    print(pd.DataFrame(rows).to_string(index=False))
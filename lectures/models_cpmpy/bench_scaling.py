@@ -0,0 +1,96 @@
+import json
+import time
+import argparse
+import tracemalloc
+
+import cpmpy as cp
+import instances
+
+# instance name -> (generator, arguments); small sizes by default, use --large for a real benchmark
+small = {
+    "nqueens-8": (instances.nqueens, (8,)),
+    "nqueens-32": (instances.nqueens, (32,)),
+    "bibd-7-7-3-3-1": (instances.bibd, (7, 7, 3, 3, 1)),
+    "car-20": (instances.car_sequencing, (20,)),
+    "doctor-1w": (instances.doctor, (1,)),
+    "tsp-8": (instances.tsp, (8,)),
+}
+large = {
+    "nqueens-128": (instances.nqueens, (128,)),
+    "nqueens-512": (instances.nqueens, (512,)),
+    "bibd-9-12-4-3-1": (instances.bibd, (9, 12, 4, 3, 1)),
+    "bibd-13-26-6-3-1": (instances.bibd, (13, 26, 6, 3, 1)),
+    "car-100": (instances.car_sequencing, (100,)),
+    "car-200": (instances.car_sequencing, (200,)),
+    "doctor-4w": (instances.doctor, (4,)),
+    "doctor-12w": (instances.doctor, (12,)),
+    "tsp-20": (instances.tsp, (20,)),
+    "tsp-50": (instances.tsp, (50,)),
+}
+
+
+def peak_memory(generator, args, solver="ortools"):
+    # peak memory of the Python allocations (model and transformation) in MB, in a pass of its own
+    # because tracemalloc slows down every allocation
+    tracemalloc.start()
+    model, _ = generator(*args)
+    cp.SolverLookup.get(solver, model)
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return peak
+
+
+def measure(generator, args, solver="ortools", time_limit=10):
+    # times in seconds, peak memory in MB
+    t0 = time.perf_counter()
+    model, _ = generator(*args)
+    t1 = time.perf_counter()
+    s = cp.SolverLookup.get(solver, model)  # transforms and posts the model
+    t2 = time.perf_counter()
+    s.solve(time_limit=time_limit)
+    t3 = time.perf_counter()
+    return dict(build=t1 - t0, transform=t2 - t1, solve=t3 - t2, peak_mb=peak_memory(generator, args, solver),
+                status=s.status().exitstatus.name)
+
+
+def regressions(results, baseline, threshold=1.5, noise=0.05):
+    # metrics that got more than 'threshold' times worse, ignoring differences below 'noise'
+    flagged = []
+    for name, res in results.items():
+        for metric in ("build", "transform", "solve", "peak_mb"):
+            if name not in baseline or metric not in baseline[name]:
+                continue
+            old, new = baseline[name][metric], res[metric]
+            if new > threshold * old and new - old > noise:
+                flagged.append((name, metric, old, new))
+    return flagged
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scaling benchmark of the lecture models")
+    parser.add_argument("--large", action="store_true", help="run the large instances")
+    parser.add_argument("--solver", default="ortools")
+    parser.add_argument("--time-limit", type=float, default=10)
+    parser.add_argument("--out", help="write the results to this json file")
+    parser.add_argument("--baseline", help="json file of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=1.5, help="flag a regression when this many times slower")
+    args = parser.parse_args()
+
+    results = {}
+    for name, (generator, gen_args) in (large if args.large else small).items():
+        results[name] = measure(generator, gen_args, solver=args.solver, time_limit=args.time_limit)
+        r = results[name]
+        print(f"{name:20s} build {r['build']:7.3f}s  transform {r['transform']:7.3f}s  "
+              f"solve {r['solve']:7.3f}s  peak {r['peak_mb']:7.1f}MB  {r['status']}", flush=True)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            flagged = regressions(results, json.load(f), threshold=args.threshold)
+        for name, metric, old, new in flagged:
+            print(f"REGRESSION {name} {metric}: {old:.3f} -> {new:.3f}")
+        if len(flagged) == 0:
+            print("No regressions")
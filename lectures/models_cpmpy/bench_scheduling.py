@@ -0,0 +1,71 @@
+import time
+import resource
+import multiprocessing as mp
+from queue import Empty
+
+import numpy as np
+import pandas as pd
+from cpmpy.transformations.get_variables import get_variables_model
+from cpmpy.transformations.normalize import toplevel_list
+from scheduling_decompositions import scheduling_model_global, scheduling_model_time_resource, \
+    scheduling_model_task_resource, scheduling_model_event
+
+models = [scheduling_model_global, scheduling_model_time_resource, scheduling_model_task_resource, scheduling_model_event]
+t_maxs = [40, 200]  # sweep of the scheduling window, e.g. [40, 200, 1000, 5000]
+nr_taskss = [4, 6]  # sweep of the number of tasks, e.g. [5, 10, 20, 50]
+capacity = 3
+time_limit = 2
+grace = 60  # seconds for building and transforming the model, on top of the time limit
+
+
+def measure(builder, durations, t_max, capacity, results):
+    # in a fresh process, so that the peak RSS belongs to this model only; a forked child starts with the
+    # RSS of its parent in ru_maxrss, so the peak is reported above that baseline
+    base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    model, start = builder(durations, t_max, capacity)
+    n_vars = len(get_variables_model(model))
+    n_cons = len(toplevel_list(model.constraints))
+    model.solve(time_limit=time_limit)
+    peak = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base) / 1024  # KB on Linux
+    results.put(dict(vars=n_vars, cons=n_cons, peak_rss_mb=peak, solve=model.status().runtime,
+                     status=model.status().exitstatus.name, makespan=model.objective_value()))
+
+
+def run(builder, durations, t_max, capacity):
+    # measure() in a fresh process; a process that crashes or hangs gives a row with only its status
+    results = mp.Queue()
+    p = mp.Process(target=measure, args=(builder, durations, t_max, capacity, results))
+    p.start()
+    t0 = time.time()
+    while True:
+        try:
+            row = results.get(timeout=1)
+            break
+        except Empty:
+            if not p.is_alive():
+                try:  # it may have sent its result just before exiting
+                    row = results.get(timeout=1)
+                except Empty:
+                    row = dict(status=f"CRASHED ({p.exitcode})")
+                break
+            if time.time() - t0 > time_limit + grace:
+                p.kill()
+                row = dict(status="KILLED")
+                break
+    p.join()
+    return row
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    rows = []
+    for nr_tasks in nr_taskss:
+        for t_max in t_maxs:
+            # durations that fill about half of the window at the given capacity
+            durations = rng.integers(1, max(2, t_max * capacity // nr_tasks), size=nr_tasks)
+            for builder in models:
+                row = run(builder, durations, t_max, capacity)
+                rows.append(dict(model=builder.__name__.replace("scheduling_model_", ""), nr_tasks=nr_tasks, t_max=t_max, **row))
+
+    pd.set_option("display.width", 200)
+    print(pd.DataFrame(rows).to_string(index=False))
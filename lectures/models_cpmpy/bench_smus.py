@@ -0,0 +1,57 @@
+import time
+
+import numpy as np
+import cpmpy as cp
+
+from smus import ExplanationSession
+
+n_queries = 100
+solver = "pysat" if "pysat" in cp.SolverLookup.solvernames() else "ortools"
+
+# the puzzle of T01_sudoku.py
+e = 0
+given = np.array([
+    [8, e, e, e, e, e, e, e, e],
+    [e, e, 3, 6, e, e, e, e, e],
+    [e, 7, e, e, 9, e, 2, e, e],
+    [e, 5, e, e, e, 7, e, e, e],
+    [e, e, e, e, 4, 5, 7, e, e],
+    [e, e, e, 1, e, e, e, 3, e],
+    [e, e, 1, e, e, e, e, 6, 8],
+    [e, e, 8, 5, e, e, e, 1, e],
+    [e, 9, e, e, e, e, 4, e, e]])
+
+grid = cp.intvar(1, 9, shape=given.shape, name="grid")
+hard = [cp.AllDifferent(row) for row in grid] + [cp.AllDifferent(col) for col in grid.T] + \
+       [cp.AllDifferent(grid[i:i + 3, j:j + 3]) for i in range(0, 9, 3) for j in range(0, 9, 3)]
+
+
+def queries(n, seed=0):
+    # the user's current state: two entries from a pool of wrong ones, and a few givens (temporarily) removed
+    rng = np.random.default_rng(seed)
+    empty = [tuple(rc) for rc in rng.permutation(np.argwhere(given == 0))[:5]]
+    wrong = [grid[r, c] == rng.choice(given[r][given[r] != 0]) for r, c in empty]  # value given elsewhere in the row
+    cells = list(zip(*np.nonzero(given)))
+    removable = [k for k, (r, c) in enumerate(cells) if r not in {r for r, _ in empty}]  # so it stays UNSAT
+    for _ in range(n):
+        dropped = set(rng.choice(removable, size=3, replace=False).tolist())
+        soft = [grid[r, c] == given[r, c] for k, (r, c) in enumerate(cells) if k not in dropped]
+        yield soft + [wrong[k] for k in rng.choice(len(wrong), size=2, replace=False)]
+
+
+if __name__ == "__main__":
+    t0 = time.perf_counter()
+    session = ExplanationSession(hard, solver=solver)
+    sizes = [len(session.smus(soft)) for soft in queries(n_queries)]
+    t_session = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    calls = 0
+    for soft, size in zip(queries(n_queries), sizes):
+        fresh = ExplanationSession(hard, solver=solver)  # all state thrown away, as smus() does
+        assert len(fresh.smus(soft)) == size
+        calls += fresh.oracle_calls
+    t_fresh = time.perf_counter() - t0
+
+    print(f"{n_queries} queries, oracle calls: {calls} fresh ({t_fresh:.2f}s), "
+          f"{session.oracle_calls} with one session ({t_session:.2f}s)")
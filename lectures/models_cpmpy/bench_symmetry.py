@@ -0,0 +1,46 @@
+import time
+
+import networkx as nx
+import pandas as pd
+import cpmpy as cp
+
+from instances import bibd
+from symmetry import symmetry_breaking
+
+time_limit = 5
+
+
+def colouring(n, p, k, seed=0):
+    # decision version of graph_coloring in t3_graph_colouring.py: k colours, no objective
+    graph = nx.gnp_random_graph(n, p, seed=seed)
+    nodes = cp.intvar(1, k, shape=n, name="Node")
+    return cp.Model([nodes[a] != nodes[b] for a, b in graph.edges()])
+
+
+def run(name, model, all_solutions):
+    rows = []
+    t0 = time.perf_counter()
+    breaking, generators = symmetry_breaking(model)
+    detect = time.perf_counter() - t0
+    for extra in [[], breaking]:
+        s = cp.SolverLookup.get("ortools", cp.Model(model.constraints, extra))
+        t0 = time.perf_counter()
+        if all_solutions:
+            found = s.solveAll(time_limit=time_limit, num_search_workers=1)
+        else:
+            found = int(s.solve(time_limit=time_limit, num_search_workers=1))
+        rows.append(dict(instance=name, lex_leader=len(extra), generators=len(generators),
+                         detect=detect if len(extra) > 0 else 0, solutions=found, status=s.status().exitstatus.name,
+                         branches=s.ort_solver.num_branches, solve=time.perf_counter() - t0))
+    return rows
+
+
+if __name__ == "__main__":
+    rows = []
+    for args in [(7, 7, 3, 3, 1), (6, 10, 5, 3, 2)]:  # all solutions
+        rows += run(f"bibd{args}", bibd(*args)[0], all_solutions=True)
+    for n, p, k, seed in [(30, 0.5, 6, 1), (30, 0.5, 7, 1), (40, 0.3, 5, 0)]:  # one solution, or UNSAT
+        rows += run(f"colour(n={n},p={p},k={k})", colouring(n, p, k, seed), all_solutions=False)
+
+    pd.set_option("display.width", 200)
+    print(pd.DataFrame(rows).to_string(index=False))
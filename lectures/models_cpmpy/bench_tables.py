@@ -0,0 +1,32 @@
+import time
+
+import pandas as pd
+import cpmpy as cp
+
+from compress_table import compressed_table, shift_table
+
+# rule-generated shift-compatibility tables, posted as the raw table or in compressed form
+time_limit = 20
+
+if __name__ == "__main__":
+    rows = []
+    for n_workers in [6, 8, 10]:
+        table = shift_table(n_workers)
+        for solver in ["ortools", "pysat"]:
+            for method in ["raw", "compressed"]:
+                W = cp.intvar(0, 3, shape=n_workers, name="W")
+                t0 = time.perf_counter()
+                if method == "raw":
+                    con, stats = cp.Table(W, table), dict(form="table", ratio=1.0)
+                else:
+                    con, stats = compressed_table(W, table, solver)
+                t1 = time.perf_counter()
+                s = cp.SolverLookup.get(solver, cp.Model(con, W[0] == 3, cp.sum(W) >= 3 * n_workers // 2))
+                t2 = time.perf_counter()
+                s.solve(time_limit=time_limit)
+                rows.append(dict(workers=n_workers, rows=len(table), solver=solver, method=method, form=stats["form"],
+                                 ratio=stats["ratio"], build=t1 - t0, transform=t2 - t1, solve=time.perf_counter() - t2,
+                                 status=s.status().exitstatus.name))
+
+    pd.set_option("display.width", 200)
+    print(pd.DataFrame(rows).to_string(index=False))
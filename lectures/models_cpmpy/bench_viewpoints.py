@@ -0,0 +1,112 @@
+import time
+
+import numpy as np
+import pandas as pd
+import cpmpy as cp
+from cpmpy.expressions.utils import flatlist
+
+from viewpoints import channel, prune_implied
+
+# single viewpoint versus both viewpoints channelled, each constraint posted in the viewpoint where it is natural
+variants = ["primal", "dual", "channelled", "channelled, pruned"]
+time_limit = 5
+
+
+def seating(variant, n_students=48, n_tables=16, table_size=4, n_programs=3, seed=0):
+    # t5_student_seating.py, larger: conflicting students are at different tables, friends at the same table,
+    # at most 2 students of a program per table; minimise the number of tables in use
+    rng = np.random.default_rng(seed)
+    program = rng.integers(1, n_programs + 1, size=n_students)
+    pairs = rng.permutation(n_students)
+    friends = pairs[:n_students // 2].reshape(-1, 2)
+    conflicts = rng.integers(0, n_students, size=(n_students, 2))
+    conflicts = conflicts[conflicts[:, 0] != conflicts[:, 1]]
+    n_chairs = n_tables * table_size
+    tables = np.arange(n_chairs).reshape(n_tables, table_size)  # chair numbers - 1 per table
+
+    students = cp.intvar(1, n_chairs, shape=n_students, name="students")
+    chairs = cp.intvar(0, n_students, shape=n_chairs, name="chairs")
+    table_of = (students - 1) // table_size
+    program_of = cp.cpm_array(np.r_[0, program])  # program of the student on a chair, 0 if empty
+    primal = [
+        cp.AllDifferent(students),
+        [table_of[a] != table_of[b] for a, b in conflicts],
+        [table_of[a] == table_of[b] for a, b in friends],
+    ]
+    dual = [
+        cp.AllDifferentExceptN(chairs, 0),
+        [cp.Count(chairs, i + 1) == 1 for i in range(n_students)],  # everyone is seated
+        [cp.Count(chairs[t], a + 1) + cp.Count(chairs[t], b + 1) <= 1 for t in tables for a, b in conflicts],
+        [cp.Count(chairs[t], a + 1) == cp.Count(chairs[t], b + 1) for t in tables for a, b in friends],
+    ]
+    primal_program = [cp.sum(table_of[program == p] == t) <= 2 for t in range(n_tables) for p in range(1, n_programs + 1)]
+    dual_program = [cp.sum([program_of[chairs[c]] == p for c in t]) <= 2 for t in tables for p in range(1, n_programs + 1)]
+    primal_used = cp.sum([cp.any(table_of == t) for t in range(n_tables)])
+    dual_used = cp.sum([cp.any(chairs[t] != 0) for t in tables])
+
+    if variant == "primal":
+        model = cp.Model(primal, primal_program)
+        model.minimize(primal_used)
+    elif variant == "dual":
+        model = cp.Model(dual, dual_program)
+        model.minimize(dual_used)
+    else:
+        model = cp.Model(primal, dual[0], dual_program, channel(students, chairs, base=1, empty=0))
+        model.minimize(dual_used)
+        if variant == "channelled, pruned":
+            model, _ = prune_implied(model, students, chairs, base=1, empty=0)
+    return model
+
+
+def job_allocation(variant, n_jobs=30, n_apps=80, team_size=2, seed=0):
+    # T01_jobAlloc.py, larger: an applicant per job, only qualified applicants, at most one job per team
+    # of applicants; minimise the salaries
+    rng = np.random.default_rng(seed)
+    salary = rng.integers(600, 1000, size=n_apps)
+    qualified = rng.random((n_jobs, n_apps)) < 0.3
+    teams = np.arange(n_apps).reshape(-1, team_size)
+
+    worker = cp.intvar(0, n_apps - 1, shape=n_jobs, name="worker")  # applicant per job
+    job = cp.intvar(0, n_jobs, shape=n_apps, name="job")  # job + 1 per applicant, 0 if none
+    primal = [
+        cp.AllDifferent(worker),
+        [cp.InDomain(worker[j], np.flatnonzero(qualified[j])) for j in range(n_jobs)],
+    ]
+    dual = [
+        cp.AllDifferentExceptN(job, 0),
+        [cp.Count(job, j + 1) == 1 for j in range(n_jobs)],  # every job is taken
+        [cp.InDomain(job[a], np.r_[0, np.flatnonzero(qualified[:, a]) + 1]) for a in range(n_apps)],
+    ]
+    primal_team = [cp.sum([cp.any(worker == a) for a in team]) <= 1 for team in teams]
+    dual_team = [cp.sum(job[team] != 0) <= 1 for team in teams]
+    primal_cost = cp.sum(cp.cpm_array(salary)[worker])
+    dual_cost = cp.sum(salary * (job != 0))
+
+    if variant == "primal":
+        model = cp.Model(primal, primal_team)
+        model.minimize(primal_cost)
+    elif variant == "dual":
+        model = cp.Model(dual, dual_team)
+        model.minimize(dual_cost)
+    else:
+        model = cp.Model(primal, dual[0], dual_team, channel(worker, job, base=1, empty=0))
+        model.minimize(primal_cost)
+        if variant == "channelled, pruned":
+            model, _ = prune_implied(model, worker, job, base=1, empty=0)
+    return model
+
+
+if __name__ == "__main__":
+    rows = []
+    for name, build in [("seating", seating), ("job allocation", job_allocation)]:
+        for variant in variants:
+            model = build(variant)
+            s = cp.SolverLookup.get("ortools", model)
+            t0 = time.perf_counter()
+            s.solve(time_limit=time_limit, num_workers=1)  # single worker, for comparable node counts
+            rows.append(dict(problem=name, variant=variant, constraints=len(flatlist(model.constraints)),
+                             nodes=s.ort_solver.NumBranches(), time=time.perf_counter() - t0,
+                             status=s.status().exitstatus.name, objective=s.objective_value()))
+
+    pd.set_option("display.width", 200)
+    print(pd.DataFrame(rows).to_string(index=False))
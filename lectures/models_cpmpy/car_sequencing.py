@@ -1,4 +1,5 @@
 import cpmpy as cp
+import numpy as np
 
 
 # the CPMpy model and variables
@@ -29,3 +30,63 @@ def model_car_sequence(demand, per_slots, at_most, requires):
             model.add(cp.sum(option[slotrange, o]) <= at_most[o])
 
     return model, (sequence, option)
+
+
+# vectorised builder, same model: one Table per slot and the windows as array operations
+def model_car_sequence_table(demand, per_slots, at_most, requires):
+    n_cars = sum(demand)
+    n_options = len(at_most)
+    n_classes = len(demand)
+    # class/option table: row c is [c, requires[c,0], ..., requires[c,n_options-1]]
+    table = np.column_stack([np.arange(n_classes), np.asarray(requires, dtype=int)])
+
+    model = cp.Model()
+    sequence = cp.intvar(0, n_classes - 1, shape=n_cars, name="sequence")
+    option = cp.boolvar(shape=(n_cars, n_options), name="option")
+
+    model.add(cp.GlobalCardinalityCount(sequence, range(n_classes), demand))
+
+    # channel each slot's class and its options in one go
+    model.add([cp.Table([sequence[s]] + list(option[s]), table) for s in range(n_cars)])
+
+    # all windows of an option at once: row s of 'windows' holds slots s..s+per_slots[o]-1
+    for o in range(n_options):
+        if per_slots[o] > n_cars:  # no window fits, as in the loop of model_car_sequence
+            continue
+        windows = np.arange(n_cars - per_slots[o] + 1)[:, None] + np.arange(per_slots[o])
+        model.add(option[windows, o].sum(axis=1) <= at_most[o])
+
+    return model, (sequence, option)
+
+
+def read_csplib(f):
+    """
+    Stream the instances of a CSPLib (prob001) car sequencing file, a filename or an open file.
+    Format: 'n_cars n_options n_classes', the at_most line, the per_slots line,
+    then one line per class: 'class demand requires...'. Lines starting with '#' are skipped,
+    so several instances can follow each other in one file.
+
+    Yields (demand, per_slots, at_most, requires) tuples.
+    """
+    if isinstance(f, str):
+        with open(f) as fh:
+            yield from read_csplib(fh)
+        return
+
+    def numbers():
+        for line in f:
+            if not line.startswith("#"):
+                yield from (int(tok) for tok in line.split())
+
+    nums = numbers()
+    for n_cars in nums:
+        n_options, n_classes = next(nums), next(nums)
+        at_most = [next(nums) for _ in range(n_options)]
+        per_slots = [next(nums) for _ in range(n_options)]
+        demand, requires = [0] * n_classes, [None] * n_classes
+        for _ in range(n_classes):
+            c, demand_c = next(nums), next(nums)
+            demand[c] = demand_c
+            requires[c] = [next(nums) for _ in range(n_options)]
+        assert sum(demand) == n_cars, f"demand sums to {sum(demand)}, expected {n_cars} cars"
+        yield demand, per_slots, at_most, requires
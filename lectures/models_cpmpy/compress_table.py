@@ -0,0 +1,163 @@
+import time
+
+import numpy as np
+import cpmpy as cp
+from cpmpy.expressions.globalconstraints import STAR
+from cpmpy.expressions.utils import get_bounds
+from cpmpy.solvers.utils import SolverLookup
+
+
+def _unique_rows(rows):
+    # np.unique(rows, axis=0) with the index of the first occurrence, the inverse and the counts;
+    # rows are sorted on a mixed-radix integer key per row when that fits in 63 bits, much faster than axis=0
+    if len(rows) == 0 or rows.shape[1] == 0 or \
+            np.sum(np.log2(rows.max(axis=0) - rows.min(axis=0) + 1)) >= 63:
+        unique, index, inverse, counts = np.unique(rows, axis=0, return_index=True, return_inverse=True,
+                                                   return_counts=True)
+        return unique, index, inverse.reshape(-1), counts
+    low = rows.min(axis=0)
+    width = rows.max(axis=0) - low + 1
+    radix = np.cumprod(np.r_[width[1:], 1][::-1])[::-1]  # the first column is the most significant
+    _, index, inverse, counts = np.unique((rows - low) @ radix, return_index=True, return_inverse=True, return_counts=True)
+    return rows[index], index, inverse.reshape(-1), counts
+
+
+def short_tuples(table, domains):
+    """
+    Compress a table (2D numpy array, one allowed tuple per row) into short tuples with wildcards:
+    rows that only differ in column j, and together cover the whole domain of column j, become one row with
+    '*' in column j. Column by column, until nothing merges any more (greedy, so not always the smallest).
+    The 'domains' (one list of values per column) are those of the variables: a '*' stands for all of them,
+    so every value of the table must be in the domain of its column.
+
+    Returns a 2D object array with ints and STAR ('*'), as cp.ShortTable takes.
+    """
+    table = _unique_rows(np.asarray(table, dtype=np.int64))[0]
+    n, k = table.shape
+    if len(domains) != k:
+        raise ValueError(f"Expected {k} domains, one per column, got {len(domains)}")
+    domains = [np.unique(np.asarray(list(dom), dtype=np.int64)) for dom in domains]
+    for j, dom in enumerate(domains):
+        outside = np.setdiff1d(table[:, j], dom)
+        if len(outside) > 0:
+            raise ValueError(f"Values {outside.tolist()} of column {j} are not in its domain")
+    if n == 0:
+        return table.astype(object)
+    star = table.min() - 1  # sentinel for STAR, outside of all domains
+
+    changed = True
+    while changed:
+        changed = False
+        for j in range(k):
+            # group the rows on all other columns, rows are unique so the values in column j differ within a group
+            _, _, group, counts = _unique_rows(np.delete(table, j, axis=1))
+            has_star = np.bincount(group, weights=table[:, j] == star) > 0  # a star subsumes the rest of its group
+            full = has_star | (counts == len(domains[j]))
+            merge = full[group] & (counts[group] > 1)
+            if merge.any():
+                table[merge, j] = star
+                table = _unique_rows(table)[0]
+                changed = True
+
+    short = table.astype(object)
+    short[table == star] = STAR
+    return short
+
+
+def table_mdd(table):
+    """
+    Reduced MDD (multi-valued decision diagram) of the tuples of a table: the trie of the rows,
+    where the nodes of a level with the same outgoing arcs are merged, bottom-up.
+
+    Returns a list of transitions (node, value, node) as cp.MDD and cp.Regular take,
+    node 0 is the root and the last node is the sink.
+    """
+    table = _unique_rows(np.asarray(table, dtype=np.int64))[0]
+    n, k = table.shape
+    low, width = (table.min(), table.max() - table.min() + 1) if n > 0 else (0, 1)
+    # prefix[i][r]: the trie node at level i on the path of row r
+    prefix = [np.zeros(n, dtype=np.int64)]
+    for i in range(k):
+        prefix.append(np.unique(prefix[i] * width + (table[:, i] - low), return_inverse=True)[1].reshape(-1))
+
+    node_class = np.zeros(n, dtype=np.int64)  # the trie leaves (one per row) are all the sink
+    levels = []  # per level: arcs (class, value, class of the child)
+    for i in reversed(range(k)):
+        arcs = _unique_rows(np.column_stack([prefix[i], table[:, i], node_class[prefix[i + 1]]]))[0]
+        # the trie nodes of level i are 0..m-1, their arcs are consecutive rows: the signature of a node
+        starts = np.flatnonzero(np.r_[True, arcs[1:, 0] != arcs[:-1, 0]])
+        ids = dict()
+        node_class = np.array([ids.setdefault(sig.tobytes(), len(ids)) for sig in np.split(arcs[:, 1:], starts[1:])],
+                              dtype=np.int64)
+        levels.append(_unique_rows(np.column_stack([node_class[arcs[:, 0]], arcs[:, 1:]]))[0])
+
+    transitions, offset = [], 0
+    for arcs in reversed(levels):  # number the nodes level by level, from the root
+        n_nodes = int(arcs[:, 0].max()) + 1
+        transitions += [(offset + int(a), int(v), offset + n_nodes + int(b)) for a, v, b in arcs]
+        offset += n_nodes
+    return transitions
+
+
+def compressed_table(array, table, solver=None):
+    """
+    Table constraint over 'array' for a large table (a 2D numpy array of allowed tuples), in the smallest form
+    the solver supports natively: the table itself, short tuples (ShortTable), or the reduced MDD (as an MDD,
+    or as a Regular constraint, an MDD is a layered automaton). The size of a form is the number of integers
+    in it. Rows with values outside of the domains of the variables are removed first.
+    When the solver supports none of these natively, the smallest form is decomposed.
+
+    Returns (constraint, stats), stats is a dict with the number of rows, short rows and MDD arcs, the chosen form,
+    the compression ratio (original size / chosen size) and the build time.
+    """
+    t0 = time.perf_counter()
+    array = cp.cpm_array(array).reshape(-1)
+    table = _unique_rows(np.asarray(table, dtype=np.int64).reshape(-1, len(array)))[0]
+    bounds = [get_bounds(x) for x in array]
+    domains = [range(lb, ub + 1) for lb, ub in bounds]
+    in_domain = np.all([(table[:, j] >= lb) & (table[:, j] <= ub) for j, (lb, ub) in enumerate(bounds)], axis=0)
+    table = table[in_domain.reshape(-1)]
+    if len(table) == 0:
+        return cp.Table(array, table), dict(rows=0, form="table", ratio=1, time=time.perf_counter() - t0)
+
+    short = short_tuples(table, domains)
+    transitions = table_mdd(table)
+    sink = transitions[-1][2]
+    forms = {  # name -> (size, constructor)
+        "table": (table.size, lambda: cp.Table(array, table)),
+        "short_table": (short.size, lambda: cp.ShortTable(array, short)),
+        "mdd": (3 * len(transitions), lambda: cp.MDD(array, transitions, reduce=False)),
+        "regular": (3 * len(transitions), lambda: cp.Regular(array, transitions, 0, [sink])),
+    }
+    supported = SolverLookup.lookup(solver).supported_global_constraints
+    candidates = [f for f in forms if f in supported] or list(forms)
+    form = min(candidates, key=lambda f: forms[f][0])
+    con = forms[form][1]()
+    stats = dict(rows=len(table), short_rows=len(short), mdd_arcs=len(transitions), form=form,
+                 ratio=table.size / forms[form][0], time=time.perf_counter() - t0)
+    return con, stats
+
+
+def shift_table(n_workers, n_shifts=4, max_night=2, min_off=2):
+    """
+    Rule-generated compatibility table of the shifts of 'n_workers' workers (0 is off, n_shifts-1 is the night):
+    at most 'max_night' night shifts, at least 'min_off' workers off, and worker i+1 can not take an earlier
+    shift than worker i unless one of them is off. All tuples in one vectorised pass over the full product.
+    """
+    shifts = np.indices((n_shifts,) * n_workers).reshape(n_workers, -1).T
+    night, off = n_shifts - 1, 0
+    ok = ((shifts == night).sum(axis=1) <= max_night) & ((shifts == off).sum(axis=1) >= min_off)
+    ok &= np.all((shifts[:, 1:] >= shifts[:, :-1]) | (shifts[:, 1:] == off) | (shifts[:, :-1] == off), axis=1)
+    return shifts[ok]
+
+
+if __name__ == "__main__":
+    table = shift_table(10)
+    W = cp.intvar(0, 3, shape=10, name="W")
+    for solver in ["ortools", "pysat"]:
+        con, stats = compressed_table(W, table, solver)
+        print(solver, stats)
+        model = cp.Model(con, W[0] == 3, cp.sum(W) >= 15)
+        assert model.solve(solver=solver)
+        assert any(np.all(table == W.value(), axis=1))
+        print(W.value())
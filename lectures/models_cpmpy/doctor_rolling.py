@@ -0,0 +1,88 @@
+import time
+
+import numpy as np
+import cpmpy as cp
+
+from instances import doctor
+
+n_shifts = 4; Appt, Call, Oper, Free = range(n_shifts)
+
+
+def roster_int(n_doctors, n_weeks, operated_before=()):
+    # the model of T01_doctor.py over 'n_weeks' weeks, doctors in 'operated_before' operated the day before
+    model, roster = doctor(n_weeks, n_doctors, operated_before)
+    return model, roster, lambda: roster.value()
+
+
+def roster_bool(n_doctors, n_weeks, operated_before=()):
+    # the model of T01_doctor_bool.py over 'n_weeks' weeks
+    n_days = 7 * n_weeks
+    roster = cp.boolvar(shape=(n_doctors, n_days, n_shifts), name="roster")
+    model = cp.Model(
+        [cp.sum(roster[:, d, Call]) == 1 for d in range(n_days)],
+        [cp.sum(roster[:, d, Oper]) <= 2 for d in range(n_days) if d % 7 <= 4],
+        [cp.sum(roster[:, s:s + 7, Oper]) >= 7 for s in range(0, n_days, 7)],
+        [cp.sum(roster[:, s:s + 7, Appt]) >= 4 for s in range(0, n_days, 7)],
+        [(roster[p, d, Oper]).implies(roster[p, d + 1, Free]) for p in range(n_doctors) for d in range(n_days - 1)],
+        [cp.sum(roster[p, d, :]) == 1 for p in range(n_doctors) for d in range(n_days)],
+        [roster[p, 0, Free] for p in operated_before],  # boundary from the previous window
+    )
+    model.maximize(cp.sum([cp.sum(roster[:, s + 5:s + 7, Free]) for s in range(0, n_days, 7)]))
+    return model, roster, lambda: np.argmax(roster.value(), axis=-1)
+
+
+builders = dict(int=roster_int, bool=roster_bool)
+
+
+def rolling_horizon(n_doctors, n_weeks, viewpoint="int", lookahead=0, solver="ortools", time_limit=10):
+    """
+    Solve a multi-week roster one week at a time. Each window covers one week plus 'lookahead' weeks;
+    only its first week is committed (fixed) and its last day gives the boundary of the next window.
+    The previous committed week is given as solution hint to warm-start the next window.
+
+    Returns the roster (doctors x days, shift numbers), the total objective and the solve time per window.
+    """
+    build = builders[viewpoint]
+    committed = []
+    operated_before = []
+    hint = None
+    times = []
+    for w in range(n_weeks):
+        window = min(1 + lookahead, n_weeks - w)
+        model, roster, shifts = build(n_doctors, window, operated_before)
+        s = cp.SolverLookup.get(solver, model)
+        if hint is not None:  # same pattern as the previous week
+            s.solution_hint(roster[:, :7].flatten(), hint.flatten())
+        t0 = time.perf_counter()
+        assert s.solve(time_limit=time_limit), f"No roster found for week {w}"
+        times.append(time.perf_counter() - t0)
+
+        week = shifts()[:, :7]
+        committed.append(week)
+        operated_before = [p for p in range(n_doctors) if week[p, -1] == Oper]
+        hint = roster[:, :7].value()
+
+    full = np.hstack(committed)
+    return full, weekend_free(full), times
+
+
+def weekend_free(roster):
+    # the objective: number of free shifts in the weekends
+    return int(sum(np.sum(roster[:, s + 5:s + 7] == Free) for s in range(0, roster.shape[1], 7)))
+
+
+if __name__ == "__main__":
+    n_doctors, n_weeks = 8, 4
+    for viewpoint in ["int", "bool"]:
+        t0 = time.perf_counter()
+        rolled, obj, times = rolling_horizon(n_doctors, n_weeks, viewpoint=viewpoint, time_limit=5)
+        t_rolling = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        model, roster, shifts = builders[viewpoint](n_doctors, n_weeks)
+        model.solve(time_limit=5)
+        t_full = time.perf_counter() - t0
+        print(f"{viewpoint}: rolling objective {obj} in {t_rolling:.2f}s "
+              f"(per window: {', '.join(f'{t:.2f}s' for t in times)}), "
+              f"full solve {model.objective_value()} in {t_full:.2f}s ({model.status().exitstatus.name}), "
+              f"loss {model.objective_value() - obj}")
@@ -0,0 +1,64 @@
+import time
+
+import cpmpy as cp
+from cpmpy.solvers.solver_interface import ExitStatus
+
+
+class IncrementalModel(cp.Model):
+    """
+    A cp.Model that keeps the solver it was last solved with. The next solve() only posts the delta:
+    the constraints added since, and the objective if it was replaced. When nothing changed, the previous
+    result (status and assignment) is returned without calling the solver, if it was final.
+
+    A fresh solver is used when another solver is asked for, or when constraints were removed or replaced.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._solver = None  # (solver name, solver object)
+        self._posted = []  # the constraints in the solver, the same objects as in self.constraints
+        self._objective = (None, None)  # (objective, is_min) in the solver
+        self._cached = None  # (solver parameters, result, status, assignment) of the last final result
+        super().__init__(*args, **kwargs)
+
+    def solve(self, solver=None, time_limit=None, **kwargs):
+        t0 = time.time()
+        n = len(self._posted)
+        if self._solver is None or self._solver[0] != solver or len(self.constraints) < n or \
+                any(c is not p for c, p in zip(self.constraints, self._posted)) or \
+                (self.objective_ is None and self._objective[0] is not None):
+            self._solver = (solver, cp.SolverLookup.get(solver, self))  # also posts the objective
+            self._cached = None
+        else:
+            s = self._solver[1]
+            if len(self.constraints) > n:
+                s += self.constraints[n:]
+                self._cached = None
+            if self.objective_ is not self._objective[0] or self.objective_is_min != self._objective[1]:
+                if self.objective_is_min:
+                    s.minimize(self.objective_)
+                else:
+                    s.maximize(self.objective_)
+                self._cached = None
+        self._posted = list(self.constraints)
+        self._objective = (self.objective_, self.objective_is_min)
+
+        # a final result holds for any time limit; results under assumptions are not cached
+        assumptions = kwargs.pop("assumptions", None)
+        params = (solver, sorted(kwargs.items()))
+        if assumptions is None and self._cached is not None and self._cached[0] == params:  # same answer
+            _, ret, self.cpm_status, assignment = self._cached
+            for v, val in assignment.items():
+                v._value = val  # another solver may have overwritten it
+            return ret
+
+        s = self._solver[1]
+        if assumptions is not None:
+            kwargs["assumptions"] = assumptions
+        ret = s.solve(time_limit=time_limit, **kwargs)
+        self.cpm_status = s.status()
+        self.cpm_status.runtime = time.time() - t0
+        final = self.cpm_status.exitstatus in (ExitStatus.OPTIMAL, ExitStatus.UNSATISFIABLE) or \
+            (self.cpm_status.exitstatus == ExitStatus.FEASIBLE and self.objective_ is None)
+        if assumptions is None:
+            self._cached = (params, ret, self.cpm_status, {v: v.value() for v in s.user_vars}) if final else None
+        return ret
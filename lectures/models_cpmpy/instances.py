@@ -0,0 +1,117 @@
+import numpy as np
+
+import cpmpy as cp
+from cpmpy.expressions.utils import all_pairs
+from car_sequencing import model_car_sequence
+
+# Parameterised versions of the lecture models, each returns (model, decision variables)
+
+
+def nqueens(N):
+    # as T01_nqueens.py
+    Row = cp.intvar(1, N, shape=N, name="Row")
+    model = cp.Model([
+        cp.AllDifferent(Row),
+        cp.AllDifferent([Row[i] - i for i in range(N)]),
+        cp.AllDifferent([Row[i] + i for i in range(N)]),
+    ])
+    return model, Row
+
+
+def sudoku(given):
+    # as T01_sudoku.py, 'given' is a 9x9 array with 0 for the empty cells
+    grid = cp.intvar(1, 9, shape=given.shape, name="grid")
+    model = cp.Model(
+        [cp.AllDifferent(row) for row in grid],
+        [cp.AllDifferent(col) for col in grid.T],
+        [cp.AllDifferent(grid[i:i + 3, j:j + 3]) for i in range(0, 9, 3) for j in range(0, 9, 3)],
+        grid[given != 0] == given[given != 0],
+    )
+    return model, grid
+
+
+def bibd(v, b, r, k, l):
+    # as T01_bibd.py: v objects (rows) in b blocks (columns), each object in r blocks,
+    # each block has k objects and each pair of objects shares l blocks
+    BIBD = cp.boolvar(shape=(v, b), name="matrix")
+    model = cp.Model(
+        [cp.sum(row) == r for row in BIBD],
+        [cp.sum(col) == k for col in BIBD.T],
+        [cp.sum(row_i * row_j) == l for row_i, row_j in all_pairs(BIBD)]
+    )
+    return model, BIBD
+
+
+def bibd_vectorised(v, b, r, k, l, double_lex=False):
+    # as bibd(), with the pairwise scalar products as linear constraints over AND-variables,
+    # both[p, c] <-> object I[p] and object J[p] are in block c, built in bulk over all pairs
+    BIBD = cp.boolvar(shape=(v, b), name="matrix")
+    I, J = np.triu_indices(v, k=1)
+    both = cp.boolvar(shape=(len(I), b), name="both")
+    model = cp.Model(
+        BIBD.sum(axis=1) == r,
+        BIBD.sum(axis=0) == k,
+        both <= BIBD[I], both <= BIBD[J], both >= BIBD[I] + BIBD[J] - 1,
+        both.sum(axis=1) == l,
+    )
+    if double_lex:  # rows and columns are interchangeable: order both lexicographically
+        model.add([cp.LexChainLessEq(BIBD), cp.LexChainLessEq(BIBD.T)])
+    return model, BIBD
+
+
+def car_sequencing_data(n_cars, n_classes=6, seed=0):
+    # random satisfiable instance with the 5 classic CSPLib options (1/2, 2/3, 1/3, 2/5, 1/5)
+    rng = np.random.default_rng(seed)
+    at_most, per_slots = [1, 2, 1, 2, 1], [2, 3, 3, 5, 5]
+    requires = rng.integers(0, 2, size=(n_classes, len(at_most)))
+    requires[0] = 0  # a class without options, always fits
+    # demand from a random sequence that respects the capacities
+    seq = []
+    for s in range(n_cars):
+        fits = [c for c in range(n_classes)
+                if all(sum(requires[d, o] for d in seq[max(0, s - per_slots[o] + 1):]) + requires[c, o] <= at_most[o]
+                       for o in range(len(at_most)))]
+        seq.append(rng.choice(fits))
+    demand = np.bincount(seq, minlength=n_classes)
+    return demand.tolist(), per_slots, at_most, requires.tolist()
+
+
+def car_sequencing(n_cars, n_classes=6, seed=0):
+    model, (sequence, option) = model_car_sequence(*car_sequencing_data(n_cars, n_classes, seed))
+    return model, sequence
+
+
+def doctor(n_weeks, n_doctors=5, operated_before=(), free_after_oper=True):
+    # as T01_doctor.py, over several weeks; doctors in 'operated_before' operated the day before.
+    # free_after_oper=False leaves out the "free after oper" implications, to post that rule differently
+    n_days = 7 * n_weeks
+    Appt, Call, Oper, Free = range(4)
+    roster = cp.intvar(0, 3, shape=(n_doctors, n_days), name="roster")
+    model = cp.Model(
+        [cp.Count(roster[:, d], Call) == 1 for d in range(n_days)],
+        [cp.Count(roster[:, d], Oper) <= 2 for d in range(n_days) if d % 7 <= 4],
+        [cp.Count(roster[:, s:s + 7], Oper) >= 7 for s in range(0, n_days, 7)],
+        [cp.Count(roster[:, s:s + 7], Appt) >= 4 for s in range(0, n_days, 7)],
+        [roster[p, 0] == Free for p in operated_before],  # boundary from the previous window
+    )
+    if free_after_oper:
+        model.add([(roster[p, d] == Oper).implies(roster[p, d + 1] == Free)
+                   for p in range(n_doctors) for d in range(n_days - 1)])
+    model.maximize(cp.sum([cp.Count(roster[:, s + 5:s + 7], Free) for s in range(0, n_days, 7)]))
+    return model, roster
+
+
+def tsp_distances(n_cities, seed=0):
+    # rounded euclidean distances between random points on a 1000x1000 grid
+    rng = np.random.default_rng(seed)
+    points = rng.integers(0, 1000, size=(n_cities, 2))
+    return np.rint(np.linalg.norm(points[:, None, :] - points[None, :, :], axis=-1)).astype(int)
+
+
+def tsp(n_cities, seed=0):
+    # as T01_tsp.py
+    distance = cp.cpm_array(tsp_distances(n_cities, seed))
+    Next = cp.intvar(0, n_cities - 1, shape=n_cities, name="Next")
+    model = cp.Model(cp.Circuit(Next))
+    model.minimize(cp.sum(distance[c, Next[c]] for c in range(n_cities)))
+    return model, Next
@@ -0,0 +1,42 @@
+from mus_assump import assump_solver
+
+
+def mcs_grow(constraints, solver="ortools"):
+    """
+    Grow a maximal satisfiable subset on one persistent solver, the complement is a (subset-minimal) MCS.
+    Same guarantee as mcs_naive; when there are several MCSes, it may return a different one.
+
+    Every solution found is used to move all constraints it already satisfies into the MSS for free,
+    and the remaining constraints are first tried as one batch, so only constraints that
+    appear in a core are ever checked one-by-one.
+    """
+    s, ind, soft = assump_solver(constraints, solver)
+    dmap = dict(zip(ind, soft))
+
+    def satisfied(todo):  # constraints true in the current solution
+        return [a for a in todo if dmap[a].value()]
+
+    s.solve()  # no assumptions: indicators are free, so always SAT
+    mss = satisfied(ind)
+    mcs = []
+    done = set(mss)  # indicators decided so far, in the MSS or the MCS
+    todo = [a for a in ind if a not in done]
+
+    while len(todo) > 0:
+        if s.solve(assumptions=mss + todo) is True:
+            mss += todo  # whole batch can be added at once
+            break
+
+        core = set(s.get_core())
+        a = next(a for a in todo if a in core)  # first candidate that takes part in the conflict
+        if s.solve(assumptions=mss + [a]) is True:
+            grown = satisfied(todo)  # includes 'a'
+            mss += grown
+            done.update(grown)
+        else:
+            mcs.append(a)  # UNSAT, causes conflict
+            done.add(a)
+        todo = [b for b in todo if b not in done]
+
+    mcs = set(mcs)
+    return [c for a, c in zip(ind, constraints) if a in mcs]
@@ -0,0 +1,122 @@
+import time
+
+import cpmpy as cp
+from cpmpy.solvers.solver_interface import ExitStatus
+
+from mus_assump import assump_solver
+
+
+def mcs_oll(constraints, weights=None, solver="ortools", time_limit=None):
+    """
+    Minimum (weighted) correction set by core-guided MaxCSP (OLL, as in RC2) on one persistent solver.
+    Returns the correction set and the anytime trace: a list of (seconds, lower bound, upper bound).
+
+    Every core raises the lower bound by its smallest weight and is relaxed by a cardinality constraint
+    over its literals: 'at most k of them violated' becomes a new soft literal, with k incremented
+    each time that literal is in a core. Stratification: only the soft literals with the highest
+    remaining weights are assumed, lighter ones are added when those are satisfiable.
+    When the 'time_limit' is reached, the best correction set so far is returned, the trace gives its gap.
+    When it is reached before the first solution, there is no correction set yet: None is returned
+    with an empty trace.
+    """
+    weights = [1] * len(constraints) if weights is None else [int(w) for w in weights]
+    s, ind, soft = assump_solver(constraints, solver)
+    t0 = time.perf_counter()
+
+    def remaining():  # seconds left, or None without time limit; solvers only accept a positive time limit
+        return None if time_limit is None else time_limit - (time.perf_counter() - t0)
+
+    def violated():  # indices of the soft constraints that are false in the current solution
+        return [i for i, c in enumerate(soft) if not c.value()]
+
+    left = remaining()
+    if (left is not None and left <= 0) or not s.solve(time_limit=left):  # without assumptions only on a time-out
+        return None, []
+    best = violated()
+    lb, ub = 0, sum(weights[i] for i in best)
+    trace = [(time.perf_counter() - t0, lb, ub)]
+
+    weight = {a: w for a, w in zip(ind, weights) if w > 0}  # soft literal -> remaining weight
+    relaxed = dict()  # bound literal -> (core number, k): at most k literals of that core false
+    bound_lits = dict()  # (core number, k) -> bound literal
+    cores = []
+
+    def add_bound(nr, k, w):
+        core = cores[nr]
+        if k >= len(core):
+            return  # all can be false, nothing to relax
+        if (nr, k) not in bound_lits:
+            b = cp.boolvar(name=f"core{nr}<={k}")
+            s.add(b.implies(cp.sum([~a for a in core]) <= k))
+            bound_lits[nr, k] = b
+            relaxed[b] = (nr, k)
+        b = bound_lits[nr, k]
+        weight[b] = weight.get(b, 0) + w
+
+    threshold = max(weight.values(), default=0)
+    while lb < ub:
+        assumptions = [a for a, w in weight.items() if w >= threshold]
+        left = remaining()
+        if left is not None and left <= 0:
+            break  # time limit
+        if s.solve(assumptions=assumptions, time_limit=left) is True:
+            cost = sum(weights[i] for i in violated())
+            if cost < ub:
+                best, ub = violated(), cost
+                trace.append((time.perf_counter() - t0, lb, ub))
+            lighter = [w for w in weight.values() if w < threshold]
+            if len(lighter) == 0:
+                lb = ub  # all soft literals satisfied: optimal
+                trace.append((time.perf_counter() - t0, lb, ub))
+            else:
+                threshold = max(lighter)  # next stratum
+        elif s.status().exitstatus == ExitStatus.UNSATISFIABLE:
+            core = s.get_core()
+            w_min = min(weight[a] for a in core)
+            lb += w_min
+            for a in core:
+                weight[a] -= w_min
+                if weight[a] == 0:
+                    del weight[a]
+                if a in relaxed:  # one more of that core may be false, at cost w_min
+                    nr, k = relaxed[a]
+                    add_bound(nr, k + 1, w_min)
+            cores.append(core)
+            add_bound(len(cores) - 1, 1, w_min)
+            trace.append((time.perf_counter() - t0, lb, ub))
+        else:
+            break  # time limit
+
+    best = set(best)
+    return [c for i, c in enumerate(constraints) if i in best], trace
+
+
+if __name__ == "__main__":
+    import numpy as np
+
+    # over-constrained: weighted preferred values and precedences 'x[i] + 3 <= x[j]' between random pairs
+    rng = np.random.default_rng(0)
+    n = 100
+    x = cp.intvar(0, 20, shape=n, name="x")
+    preferred = rng.integers(0, 21, size=n)
+    pairs = [(i, j) for i, j in rng.integers(0, n, size=(3 * n, 2)) if i != j]
+    constraints = [x[i] == preferred[i] for i in range(n)] + [x[i] + 3 <= x[j] for i, j in pairs]
+    weights = rng.integers(1, 10, size=len(constraints))
+
+    mcs, trace = mcs_oll(constraints, weights, time_limit=3)
+    if mcs is None:
+        print("OLL: no solution within the time limit")
+    else:
+        print(f"OLL: {len(constraints)} soft constraints, correction set of {len(mcs)}, weight {trace[-1][2]}, "
+              f"lower bound {trace[-1][1]}")
+        print("trace (s: lb/ub):", " ".join(f"{t:.2f}:{lb}/{ub}" for t, lb, ub in trace[::max(1, len(trace) // 10)]))
+
+    # the mcs_opt model, weighted: one maximize over all indicators
+    maxcsp_model = cp.Model()
+    B = cp.boolvar(shape=len(constraints))
+    maxcsp_model.add(B.implies(constraints))
+    maxcsp_model.maximize(cp.sum(weights * B))
+    if maxcsp_model.solve(time_limit=3):
+        print(f"single maximize: weight {sum(weights) - maxcsp_model.objective_value()} ({maxcsp_model.status().exitstatus.name})")
+    else:
+        print(f"single maximize: no solution within the time limit ({maxcsp_model.status().exitstatus.name})")
@@ -0,0 +1,114 @@
+import os
+import sys
+
+import numpy as np
+import cpmpy as cp
+from cpmpy.expressions.core import Expression
+from cpmpy.expressions.globalfunctions import Division, Modulo, Element
+from cpmpy.expressions.utils import flatlist, get_bounds
+from cpmpy.expressions.variables import _NumVarImpl
+
+from provenance import Provenance
+
+_cpmpy_dir = os.path.dirname(cp.__file__)
+
+
+class TracedModel(cp.Model):
+    """
+    A cp.Model that remembers where each constraint was added: 'file:line' of the calling code.
+    Used by validate() and bisect_crash() to report the location of the offending constraints.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.locations = Provenance()  # constraint -> source location
+        super().__init__(*args, **kwargs)
+
+    def add(self, con):
+        frame = sys._getframe(1)
+        while frame.f_code.co_filename.startswith(_cpmpy_dir) or frame.f_code.co_filename == __file__:  # from __init__
+            frame = frame.f_back
+        self.locations.add(flatlist([con]), f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno}")
+        return super().add(con)
+
+
+def _constraints_and_locations(model):
+    # top-level constraints of a model or (nested) list, and a function giving their location (None if unknown)
+    if isinstance(model, TracedModel):
+        return flatlist(model.constraints), model.locations.element
+    if isinstance(model, cp.Model):
+        model = model.constraints
+    return flatlist([model]), lambda c: None
+
+
+def validate(model):
+    """
+    Static checks, without calling a solver: walks every (sub)expression once and flags
+    partial functions that are undefined for part of their domain:
+    a division or modulo whose divisor can be 0, an Element whose index can be out of range.
+
+    Returns a list of (top-level constraint, problem, source location or None).
+    """
+    cons, location = _constraints_and_locations(model)
+    problems = []
+    seen = set()  # ids of the subexpressions already checked
+    for c in cons:
+        todo = [c]
+        while len(todo) > 0:
+            expr = todo.pop()
+            if isinstance(expr, (list, tuple, np.ndarray)):
+                todo.extend(flatlist(expr))
+                continue
+            if not isinstance(expr, Expression) or isinstance(expr, _NumVarImpl) or id(expr) in seen:
+                continue
+            seen.add(id(expr))
+
+            if isinstance(expr, (Division, Modulo)):
+                lb, ub = get_bounds(expr.args[1])
+                if lb <= 0 <= ub:
+                    problems.append((c, f"divisor of '{expr}' can be 0, domain [{lb}..{ub}]", location(c)))
+            elif isinstance(expr, Element):
+                arr, idx = expr.args
+                lb, ub = get_bounds(idx)
+                if lb < 0 or ub >= len(arr):
+                    problems.append((c, f"index of '{expr}' can be out of range: [{lb}..{ub}] for length {len(arr)}", location(c)))
+            todo.extend(expr.args)
+    return problems
+
+
+def bisect_crash(model, solver="ortools", time_limit=0.1):
+    """
+    For the errors validate() can not see: find the constraints that make the solver crash by
+    bisection (delta debugging) instead of one model per constraint. Each attempt posts a subset to a
+    fresh solver and solves it for at most 'time_limit' seconds (some solvers only check the model when solving);
+    a single offending constraint is found in O(log n) attempts.
+
+    Returns a list of (constraint, exception, source location or None), where the constraint is a list
+    when it only crashes together with other constraints.
+    """
+    cons, location = _constraints_and_locations(model)
+
+    def crash(subset):
+        try:
+            cp.SolverLookup.get(solver, cp.Model(subset)).solve(time_limit=time_limit)
+        except Exception as e:
+            return e
+        return None
+
+    found = []
+
+    def search(subset, error):  # 'subset' crashes with 'error'
+        if len(subset) == 1:
+            found.append((subset[0], error, location(subset[0])))
+            return
+        halves = [subset[:len(subset) // 2], subset[len(subset) // 2:]]
+        errors = [crash(half) for half in halves]
+        if errors[0] is None and errors[1] is None:
+            found.append((subset, error, [location(c) for c in subset]))  # only crashes in combination
+        for half, e in zip(halves, errors):
+            if e is not None:
+                search(half, e)
+
+    error = crash(cons)
+    if error is not None:
+        search(cons, error)
+    return found
@@ -0,0 +1,60 @@
+import cpmpy as cp
+
+
+def assump_solver(constraints, solver="ortools"):
+    """
+    Post all constraints once to a single solver, each one guarded by its own indicator literal.
+    Returns the solver, the list of indicators and the guarded expressions (in the order of 'constraints').
+    """
+    soft = [cp.all(c) if isinstance(c, (list, tuple)) else c for c in constraints]  # allow groups of constraints
+    ind = cp.boolvar(shape=(len(soft),), name="ind")  # shape=(n,) so that n=1 is also an array
+    s = cp.SolverLookup.get(solver)
+    s += [b.implies(c) for b, c in zip(ind, soft)]
+    return s, list(ind), soft
+
+
+def mus_assump(constraints, solver="ortools"):
+    """
+    Deletion-based MUS on one persistent solver: drop one indicator at a time and,
+    after every UNSAT call, shrink the core to the one returned by the solver (clause set refinement).
+    """
+    s, ind, _ = assump_solver(constraints, solver)
+    assert s.solve(assumptions=ind) is False, "Model should be UNSAT"
+
+    core = set(s.get_core())  # start from the solver's core, not from all constraints
+    for a in ind:
+        if a not in core:
+            continue  # already removed
+        subcore = [b for b in ind if b in core and b is not a]  # try all but 'a'
+        if s.solve(assumptions=subcore) is True:
+            continue  # removing 'a' makes it SAT, need to keep for UNSAT
+        core = set(s.get_core())  # can delete 'a', and everything else outside the new core
+
+    return [c for a, c in zip(ind, constraints) if a in core]
+
+
+def quickxplain_assump(constraints, solver="ortools"):
+    """
+    QuickXplain (Junker, 2004) on one persistent solver: divide-and-conquer deletion
+    that returns the MUS preferred by the order of 'constraints' (earlier is preferred).
+    """
+    s, ind, _ = assump_solver(constraints, solver)
+    assert s.solve(assumptions=ind) is False, "Model should be UNSAT"
+
+    def qx(background, delta, soft):
+        if len(delta) != 0 and s.solve(assumptions=background) is False:
+            return []  # conflict already in the background
+        if len(soft) == 1:
+            return soft
+        split = len(soft) // 2
+        soft1, soft2 = soft[:split], soft[split:]
+        delta2 = qx(background + soft1, soft1, soft2)  # needed from the less preferred half
+        delta1 = qx(background + delta2, delta2, soft1)  # needed from the more preferred half
+        return delta1 + delta2
+
+    # everything after the last indicator in the solver's core can be skipped
+    core = set(s.get_core())
+    last = max(i for i, a in enumerate(ind) if a in core)
+
+    found = set(qx([], [], ind[:last + 1]))
+    return [c for a, c in zip(ind, constraints) if a in found]
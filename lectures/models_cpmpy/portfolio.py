@@ -0,0 +1,120 @@
+import os
+import time
+import multiprocessing as mp
+from multiprocessing.connection import wait
+
+import pandas as pd
+import cpmpy as cp
+from cpmpy.solvers.solver_interface import ExitStatus
+
+
+def _solve(model, solver, time_limit, conn):
+    # runs in a worker process, only sends back a small result tuple over its own pipe,
+    # so killing it can not leave a shared queue locked or half-written for the other workers
+    try:
+        s = cp.SolverLookup.get(solver, model)
+        s.solve(time_limit=time_limit)
+        obj = s.objective_value() if model.objective_ is not None and s.status().exitstatus in (ExitStatus.OPTIMAL, ExitStatus.FEASIBLE) else None
+        conn.send((s.status().exitstatus.name, s.status().runtime, obj))
+    except Exception as e:  # e.g. a solver that does not support some constraint
+        conn.send((f"ERROR: {type(e).__name__}", None, None))
+    conn.close()
+
+
+def _is_proof(model, status):
+    # optimality for optimisation problems, any solution for satisfaction problems, or UNSAT
+    if status == ExitStatus.UNSATISFIABLE.name:
+        return True
+    if model.objective_ is None:
+        return status in (ExitStatus.FEASIBLE.name, ExitStatus.OPTIMAL.name)
+    return status == ExitStatus.OPTIMAL.name
+
+
+def run_matrix(models, solvers, time_limit=30, n_jobs=None, grace=5, first_wins=False):
+    """
+    Run every (model, solver) pair in its own process, at most 'n_jobs' at the same time.
+
+    'models' is a dictionary of 'problem name' -> CPMpy model, as in algorithm_selection of E6b.
+    Each run gets 'time_limit' seconds, a process that is still alive 'grace' seconds later is killed.
+    With first_wins=True, as soon as one solver proves a model (optimal, UNSAT, or a solution for a satisfaction problem),
+    the other runs of that model are cancelled.
+
+    Returns a pandas DataFrame with one row per run: model, solver, status, runtime (solver time),
+    wall (including process start-up) and objective.
+    """
+    n_jobs = n_jobs or os.cpu_count()
+    todo = [(name, solver) for name in models for solver in solvers]
+    running = {}  # key -> (process, receiving end of its pipe, start time)
+    rows = {}
+    solved = set()  # models already proven, with first_wins
+
+    def record(key, status, runtime=None, obj=None, wall=None):
+        rows[key] = dict(model=key[0], solver=key[1], status=status, runtime=runtime, wall=wall, objective=obj)
+
+    while len(todo) > 0 or len(running) > 0:
+        # start new runs while there are free workers
+        while len(todo) > 0 and len(running) < n_jobs:
+            key = todo.pop(0)
+            if key[0] in solved:
+                record(key, "CANCELLED")
+                continue
+            recv, send = mp.Pipe(duplex=False)
+            p = mp.Process(target=_solve, args=(models[key[0]], key[1], time_limit, send), daemon=True)
+            p.start()
+            send.close()  # only the worker writes
+            running[key] = (p, recv, time.time())
+
+        ready = wait([recv for _, recv, _ in running.values()], timeout=0.1)
+        for key, (p, recv, start) in list(running.items()):
+            if recv not in ready:
+                continue
+            try:
+                status, runtime, obj = recv.recv()
+            except EOFError:  # the worker died without sending a result
+                status, runtime, obj = f"CRASHED ({p.exitcode})", None, None
+            del running[key]
+            recv.close()
+            p.join()
+            record(key, status, runtime, obj, time.time() - start)
+            if first_wins and _is_proof(models[key[0]], status):
+                solved.add(key[0])
+
+        # hard kill on timeout, and cancel runs of models that are already proven;
+        # whatever a killed worker may have sent is discarded with its pipe
+        for key, (p, recv, start) in list(running.items()):
+            if key[0] in solved:
+                p.kill()
+                record(key, "CANCELLED", wall=time.time() - start)
+            elif time.time() - start > time_limit + grace:
+                p.kill()
+                record(key, "KILLED", wall=time.time() - start)
+            else:
+                continue
+            p.join()
+            recv.close()
+            del running[key]
+
+    return pd.DataFrame([rows[(name, solver)] for name in models for solver in solvers])
+
+
+def race(model, solvers, time_limit=30, grace=5):
+    """
+    Run all solvers on one model in parallel, return the name of the first one that proves it (or None)
+    together with the table of all runs.
+    """
+    df = run_matrix({"model": model}, solvers, time_limit=time_limit, n_jobs=len(solvers), grace=grace, first_wins=True)
+    proven = df[[_is_proof(model, status) for status in df["status"]]]
+    winner = proven.sort_values("wall")["solver"].iloc[0] if len(proven) > 0 else None
+    return winner, df
+
+
+if __name__ == "__main__":
+    X = cp.intvar(1, 8, shape=8, name="X")
+    queens = cp.Model(cp.AllDifferent(X), cp.AllDifferent(X + range(8)), cp.AllDifferent(X - range(8)))
+    knapsack = cp.Model(cp.sum(X * range(1, 9)) <= 50)
+    knapsack.maximize(cp.sum(X))
+
+    df = run_matrix({"queens": queens, "knapsack": knapsack}, ["ortools", "pysat"], time_limit=5, n_jobs=2)
+    print(df.pivot(index="model", columns="solver", values="runtime"))
+    print(df)
+    print(race(queens, ["ortools", "pysat"], time_limit=5))
@@ -0,0 +1,80 @@
+import numpy as np
+import cpmpy as cp
+from cpmpy.transformations.get_variables import get_variables
+
+
+class Provenance:
+    """
+    Index from the constraints and variables of a model to the problem elements they were created for:
+    an edge or node of a graph, a Sudoku cell, a roster position, ...
+
+    Filled in by the model builder, lookups are by object identity. So an explanation (a MUS, MCS, ...
+    which are subsets of the original constraint objects) is projected back onto the problem
+    in O(|cons|), without formatting or parsing the names of the variables.
+    """
+
+    def __init__(self):
+        self._cons = dict()  # id(constraint) -> (constraint, element), the object is kept so its id stays unique
+        self._vars = dict()  # id(variable) -> (variable, element)
+
+    def add(self, cons, element):
+        # all constraints in 'cons' (a constraint, or a nested list/array of them) come from 'element'
+        for c in _flat(cons):
+            self._cons[id(c)] = (c, element)
+        return cons
+
+    def add_each(self, cons, elements):
+        # constraint i of 'cons' (flattened) comes from elements[i]
+        for c, element in zip(_flat(cons), elements, strict=True):
+            self._cons[id(c)] = (c, element)
+        return cons
+
+    def add_vars(self, array, elements=None):
+        # variable array[idx] represents elements[idx], by default its index: node i, cell (r,c), ...
+        for idx in np.ndindex(np.shape(array)):
+            element = (idx[0] if len(idx) == 1 else idx) if elements is None else elements[idx]
+            self._vars[id(array[idx])] = (array[idx], element)
+        return array
+
+    def element(self, c):
+        # the element constraint 'c' was created for, None if it is not indexed (e.g. an added cut)
+        entry = self._cons.get(id(c))
+        return None if entry is None else entry[1]
+
+    def project(self, cons):
+        # the elements of the indexed constraints in 'cons', in order
+        return [self._cons[id(c)][1] for c in _flat(cons) if id(c) in self._cons]
+
+    def project_vars(self, cons):
+        # the elements of the indexed variables occurring in 'cons'
+        return {self._vars[id(v)][1] for c in _flat(cons) for v in get_variables(c) if id(v) in self._vars}
+
+
+def _flat(cons):
+    if isinstance(cons, (list, tuple, np.ndarray)):
+        for c in cons:
+            yield from _flat(c)
+    else:
+        yield cons
+
+
+if __name__ == "__main__":
+    from cpmpy.tools.explain import mus
+
+    # Sudoku cells: which givens conflict?
+    given = np.zeros((9, 9), dtype=int)
+    given[0, :3] = [1, 2, 3]
+    given[1, 3:6] = [1, 2, 3]
+    given[2, 6:8] = [4, 5]
+    given[2, 0] = 1  # clashes with the 1 in row 0's block
+    prov = Provenance()
+    grid = prov.add_vars(cp.intvar(1, 9, shape=(9, 9), name="grid"))
+    model = cp.Model(
+        [prov.add(cp.AllDifferent(row), ("row", r)) for r, row in enumerate(grid)],
+        [prov.add(cp.AllDifferent(col), ("col", c)) for c, col in enumerate(grid.T)],
+        [prov.add(cp.AllDifferent(grid[i:i + 3, j:j + 3]), ("block", i, j)) for i in range(0, 9, 3) for j in range(0, 9, 3)],
+        prov.add_each(grid[given != 0] == given[given != 0], [("given", int(r), int(c)) for r, c in zip(*np.nonzero(given))]),
+    )
+    conflict = mus(model.constraints)
+    print("conflicting constraints:", prov.project(conflict))
+    print("cells involved:", sorted(prov.project_vars(conflict)))
@@ -0,0 +1,300 @@
+import numpy as np
+import cpmpy as cp
+from cpmpy.solvers.utils import SolverLookup
+
+# A DFA is a triple (transitions, start, accepting) as cp.Regular takes: a list of (state, value, state),
+# the start state and a list of accepting states. Missing transitions reject.
+
+
+def regex_dfa(pattern, alphabet):
+    """
+    Minimal DFA of a regular expression over single-character symbols, matched against the whole sequence.
+    'alphabet' maps the symbols to values: a string (symbol i has value i) or a dict.
+
+    Syntax: symbols, '.' (any symbol), '[AC]' and '[^O]' (symbol classes), '|', '(...)', and the repeats
+    '*', '+', '?', '{m}', '{m,}', '{m,n}'. Whitespace is ignored. E.g. "free after oper" is "([^O]|OF)*O?".
+    """
+    if isinstance(alphabet, str):
+        alphabet = {a: i for i, a in enumerate(alphabet)}
+    tokens = [t for t in pattern if not t.isspace()]
+    pos = 0
+
+    def peek():
+        return tokens[pos] if pos < len(tokens) else None
+
+    def take(expected=None):
+        nonlocal pos
+        t = peek()
+        if t is None or (expected is not None and t != expected):
+            raise ValueError(f"Expected {expected or 'a symbol'} at position {pos} of '{pattern}'")
+        pos += 1
+        return t
+
+    def number():
+        digits = ""
+        while peek() is not None and peek().isdigit():
+            digits += take()
+        return int(digits) if digits else None
+
+    # recursive descent to an AST: ("set", values), ("cat", [asts]), ("alt", [asts]), ("star", ast)
+    def alternation():
+        options = [concatenation()]
+        while peek() == "|":
+            take("|")
+            options.append(concatenation())
+        return ("alt", options) if len(options) > 1 else options[0]
+
+    def concatenation():
+        parts = []
+        while peek() not in (None, "|", ")"):
+            parts.append(repeat())
+        return ("cat", parts)
+
+    def repeat():
+        ast = atom()
+        while peek() in ("*", "+", "?", "{"):
+            op = take()
+            if op == "*":
+                ast = ("star", ast)
+            elif op == "+":
+                ast = ("cat", [ast, ("star", ast)])
+            elif op == "?":
+                ast = ("alt", [ast, ("cat", [])])
+            else:
+                at = pos
+                low = number()
+                high = low
+                if peek() == ",":
+                    take(",")
+                    high = number()
+                take("}")
+                if low is None:
+                    raise ValueError(f"Expected a lower bound at position {at} of '{pattern}'")
+                if high is not None and high < low:
+                    raise ValueError(f"Upper bound {high} below lower bound {low} at position {at} of '{pattern}'")
+                tail = [("star", ast)] if high is None else [("alt", [ast, ("cat", [])])] * (high - low)
+                ast = ("cat", [ast] * low + tail)
+        return ast
+
+    def atom():
+        t = take()
+        if t == "(":
+            ast = alternation()
+            take(")")
+            return ast
+        if t == ".":
+            return ("set", set(alphabet.values()))
+        if t == "[":
+            negate = peek() == "^"
+            if negate:
+                take("^")
+            members = set()
+            while peek() != "]":
+                members.add(symbol(take()))
+            take("]")
+            return ("set", set(alphabet.values()) - members if negate else members)
+        return ("set", {symbol(t)})
+
+    def symbol(t):
+        if t not in alphabet:
+            raise ValueError(f"Unknown symbol '{t}' in '{pattern}', the alphabet is {list(alphabet)}")
+        return alphabet[t]
+
+    ast = alternation()
+    if pos != len(tokens):
+        raise ValueError(f"Unexpected '{tokens[pos]}' at position {pos} of '{pattern}'")
+
+    # Thompson construction: NFA with epsilon moves
+    eps, moves = [], []
+
+    def state():
+        eps.append([])
+        moves.append([])
+        return len(eps) - 1
+
+    def build(ast):  # returns (entry, exit) states of the fragment
+        kind, arg = ast
+        s, e = state(), state()
+        if kind == "set":
+            moves[s] += [(v, e) for v in arg]
+        elif kind == "cat":
+            cur = s
+            for part in arg:
+                ps, pe = build(part)
+                eps[cur].append(ps)
+                cur = pe
+            eps[cur].append(e)
+        elif kind == "alt":
+            for part in arg:
+                ps, pe = build(part)
+                eps[s].append(ps)
+                eps[pe].append(e)
+        else:  # star
+            ps, pe = build(arg)
+            eps[s] += [ps, e]
+            eps[pe] += [ps, e]
+        return s, e
+
+    nfa_start, nfa_end = build(ast)
+
+    def closure(states):
+        todo, seen = list(states), set(states)
+        while len(todo) > 0:
+            for t in eps[todo.pop()]:
+                if t not in seen:
+                    seen.add(t)
+                    todo.append(t)
+        return frozenset(seen)
+
+    # subset construction
+    start = closure([nfa_start])
+    number_of = {start: 0}
+    todo, transitions = [start], []
+    while len(todo) > 0:
+        subset = todo.pop()
+        for v in sorted(set(alphabet.values())):
+            target = closure([t for s in subset for w, t in moves[s] if w == v])
+            if len(target) == 0:
+                continue
+            if target not in number_of:
+                number_of[target] = len(number_of)
+                todo.append(target)
+            transitions.append((number_of[subset], v, number_of[target]))
+    accepting = [i for subset, i in number_of.items() if nfa_end in subset]
+    return minimise((transitions, 0, accepting))
+
+
+def minimise(dfa):
+    """
+    Minimal equivalent DFA: drop the states that are unreachable or can not reach an accepting state,
+    then merge equivalent states by partition refinement (Moore). States are renumbered from 0, the start.
+    """
+    transitions, start, accepting = dfa
+    delta = {(s, v): t for s, v, t in transitions}
+    values = sorted({v for _, v, _ in transitions})
+
+    reach, todo = [start], [start]  # in breadth-first order, for a deterministic numbering
+    while len(todo) > 0:
+        s = todo.pop(0)
+        for v in values:
+            t = delta.get((s, v))
+            if t is not None and t not in reach:
+                reach.append(t)
+                todo.append(t)
+    alive, changed = set(accepting) & set(reach), True
+    while changed:  # states that can reach an accepting state
+        changed = False
+        for s, v, t in transitions:
+            if t in alive and s not in alive and s in reach:
+                alive.add(s)
+                changed = True
+    states = [s for s in reach if s in alive]
+    if start not in alive:
+        return [], 0, []  # accepts nothing
+
+    block = {s: int(s in accepting) for s in states}
+    while True:
+        signature = {s: (block[s],) + tuple(block.get(delta.get((s, v)), -1) for v in values) for s in states}
+        ids = dict()
+        refined = {s: ids.setdefault(signature[s], len(ids)) for s in states}
+        stable = len(ids) == len(set(block.values()))
+        block = refined
+        if stable:
+            break
+    # block numbers follow the breadth-first order, so the start is block 0
+    transitions = sorted({(block[s], v, block[t]) for s, v, t in transitions if s in block and t in block})
+    return transitions, 0, sorted({block[s] for s in states if s in accepting})
+
+
+def layers(dfa, n):
+    """
+    The DFA unrolled over a sequence of length n: the states at each position i (reachable from the start in i
+    steps, and reaching an accepting state in n-i more) and the transitions between consecutive positions.
+    Returns (states, arcs): states[i] is a list, arcs[i] a list of (state, value, state), for i in 0..n.
+    """
+    transitions, start, accepting = dfa
+    forward = [{start}]
+    for i in range(n):
+        forward.append({t for s, v, t in transitions if s in forward[i]})
+    backward = [set(accepting)]
+    for i in range(n):
+        backward.insert(0, {s for s, v, t in transitions if t in backward[0]})
+    states = [sorted(f & b) for f, b in zip(forward, backward)]
+    arcs = [[(s, v, t) for s, v, t in transitions if s in states[i] and t in states[i + 1]] for i in range(n)]
+    return states, arcs
+
+
+def regular(array, dfa, solver=None, form=None, name="state"):
+    """
+    The sequence 'array' is accepted by 'dfa' (it is minimised first). A 2D array is one sequence per row,
+    and the decompositions are built for all rows at once.
+
+    'form' is how the automaton is posted, by default the first one the solver supports natively:
+     - "regular": the cp.Regular global constraint, one per row
+     - "table": a state variable per position (over the states that can occur there) and a table per position
+       with the transitions between them
+     - "layered": the same state variables, linked by clauses: state s and value v at position i imply the
+       next state, and state s restricts the value to those with a transition. What a SAT solver needs.
+
+    Returns a list of constraints.
+    """
+    dfa = minimise(dfa)
+    X = cp.cpm_array(array)
+    X = X.reshape(1, -1) if X.ndim == 1 else X
+    rows, n = X.shape
+    if len(dfa[0]) == 0 and not (n == 0 and 0 in dfa[2]):
+        return [cp.BoolVal(False)]
+    if form is None:
+        supported = SolverLookup.lookup(solver).supported_global_constraints
+        form = "regular" if "regular" in supported else "table" if "table" in supported else "layered"
+    if form == "regular":
+        return [cp.Regular(row, *dfa) for row in X]
+
+    states, arcs = layers(dfa, n)
+    if any(len(layer) == 0 for layer in states):
+        return [cp.BoolVal(False)]  # no accepted sequence of this length
+    # the states of each position are numbered 0..len(states[i])-1
+    index = [{s: j for j, s in enumerate(layer)} for layer in states]
+    arcs = [np.array([(index[i][s], v, index[i + 1][t]) for s, v, t in arcs[i]]) for i in range(n)]
+    Q = [cp.intvar(0, len(layer) - 1, shape=(rows,), name=f"{name}[{i}]") for i, layer in enumerate(states)]
+
+    if form == "table":
+        return [cp.Table([Q[i][r], X[r, i], Q[i + 1][r]], arcs[i]) for r in range(rows) for i in range(n)]
+    if form != "layered":
+        raise ValueError(f"Unknown form '{form}', expected 'regular', 'table' or 'layered'")
+    cons = []
+    for i in range(n):
+        for s in range(len(states[i])):
+            out = arcs[i][arcs[i][:, 0] == s]
+            cons.append(_any([Q[i] != s] + [X[:, i] == v for v in out[:, 1]]))
+            if len(states[i + 1]) > 1:
+                cons += [_any([Q[i] != s, X[:, i] != v, Q[i + 1] == t]) for _, v, t in out]
+    return cons
+
+
+def _any(arrays):
+    # elementwise disjunction of arrays of expressions
+    result = arrays[0]
+    for a in arrays[1:]:
+        result = result | a
+    return result
+
+
+if __name__ == "__main__":
+    Appt, Call, Oper, Free = range(4)
+    free_after_oper = regex_dfa("([^O]|OF)*O?", "ACOF")
+    print("free after oper:", free_after_oper)
+    # no more than 2 calls in any 3 consecutive days, on top
+    rule = regex_dfa("([AOF]|C[AOF]|CC[AOF])*(C|CC)?", "ACOF")
+    print("at most 2 calls in a row:", rule)
+
+    roster = cp.intvar(0, 3, shape=(5, 14), name="roster")
+    for solver, form in [("ortools", None), ("ortools", "table"), ("ortools", "layered"), ("pysat", None)]:
+        model = cp.Model(regular(roster, free_after_oper, solver, form),
+                         regular(roster, rule, solver, form, name="calls"),
+                         cp.sum(roster == Oper) >= 20, cp.sum(roster == Call) >= 25)
+        assert model.solve(solver=solver)
+        for row in roster.value():
+            assert all(row[d + 1] == Free for d in range(13) if row[d] == Oper)
+        print(solver, form, len(model.constraints), "constraints")
+    print(np.array(list("ACOF"))[roster.value()])
@@ -0,0 +1,414 @@
+import math
+import time
+import itertools
+import threading
+
+import cpmpy as cp
+from cpmpy.expressions.core import Expression, Comparison, Operator
+from cpmpy.expressions.globalconstraints import AllDifferent
+from cpmpy.expressions.globalfunctions import Element
+from cpmpy.expressions.utils import flatlist, is_num
+from cpmpy.expressions.variables import _BoolVarImpl, _IntVarImpl, NegBoolView
+from cpmpy.exceptions import NotSupportedError
+from cpmpy.solvers.solver_interface import ExitStatus, SolverStatus
+from cpmpy.transformations.get_variables import get_variables
+from pysat.card import CardEnc, EncType
+from pysat.formula import IDPool
+from pysat.pb import PBEnc
+
+encodings = ("direct", "order", "log")
+
+
+class CNF:
+    """
+    CNF of a model, with a selectable SAT encoding per integer variable:
+     - "direct": one literal per value, x == v, with exactly-one over them
+     - "order": one literal per value but the first, x >= v, each implies the previous (ladder)
+     - "log": the bits of x - lb, with clauses that exclude the values above ub
+
+    The constraints are encoded to match: AllDifferent over direct variables as at-most-one per value, otherwise
+    as pairwise !=; != between aligned log variables with one 'bits differ' literal per bit; linear sums as
+    cardinality constraints when all weights are 1 (as for order variables and Booleans), as pseudo-Boolean
+    otherwise; Element per index value. Supported are the constraints of the lecture models: Boolean literals,
+    AllDifferent, comparisons between x + c terms, x - y != k, linear comparisons (but !=) over Booleans,
+    products of two Booleans and integers, and Element(arr, idx) == y; others raise NotSupportedError.
+
+    'encoding' is "auto", one of the encodings, or a dict {variable: encoding} with "auto" for the others.
+    "auto" chooses per variable by domain size and usage: log above 'max_direct' values; order when it occurs
+    in a linear sum, an ordering (<, <=, >, >=), or a disequality or AllDifferent over shifted terms x + c
+    (the N-queens diagonals, where direct is 10-30x slower from 32 queens on); direct otherwise.
+    The clauses are in DIMACS form (lists of non-zero ints), for any SAT solver, see solve().
+    """
+
+    def __init__(self, model, encoding="auto", max_direct=64):
+        self.pool = IDPool()
+        self.clauses = []
+        self.encoded = dict()  # id(int var) -> (var, encoding, literals)
+        self.bools = dict()  # id(bool var) -> (var, literal)
+        cons = flatlist(model.constraints if isinstance(model, cp.Model) else model)
+
+        ordered = set()  # usage: the integer variables that "auto" encodes with the order encoding
+        for c in cons:
+            if isinstance(c, Comparison) and (c.name in ("<", "<=", ">", ">=") or
+                                              isinstance(c.args[0], Operator) and c.args[0].name in ("sum", "wsum")):
+                ordered |= {id(v) for v in get_variables(c)}
+            elif isinstance(c, AllDifferent) or (isinstance(c, Comparison) and c.name == "!="):
+                terms = [_affine(a) for a in c.args]
+                if any(t is not None and t[0] is not None and t[1] != 0 for t in terms):
+                    ordered |= {id(v) for v in get_variables(c)}
+        overrides = {id(v): e for v, e in encoding.items()} if isinstance(encoding, dict) else dict()
+        default = "auto" if isinstance(encoding, dict) else encoding
+        for v in get_variables(cons):
+            if isinstance(v, _BoolVarImpl):
+                continue
+            choice = overrides.get(id(v), default)
+            if choice == "auto":
+                choice = "log" if v.ub - v.lb + 1 > max_direct else "order" if id(v) in ordered else "direct"
+            self._encode_var(v, choice)
+
+        for c in cons:
+            self._encode_constraint(c)
+        self._status = SolverStatus("cnf")
+
+    # --- variables
+
+    def _new(self):
+        return self.pool.id()
+
+    def _bool(self, b):
+        if isinstance(b, NegBoolView):
+            return -self._bool(b._bv)
+        if id(b) not in self.bools:
+            self.bools[id(b)] = (b, self._new())
+        return self.bools[id(b)][1]
+
+    def _encode_var(self, x, encoding):
+        assert encoding in encodings, f"Unknown encoding '{encoding}', expected one of {encodings}"
+        size = x.ub - x.lb + 1
+        if encoding == "direct":
+            lits = [self._new() for _ in range(size)]
+            self.clauses.append(lits)
+            self.clauses += self._amo(lits)
+        elif encoding == "order":
+            lits = [self._new() for _ in range(size - 1)]  # lits[i] <-> x >= lb + 1 + i
+            self.clauses += [[-b, a] for a, b in zip(lits, lits[1:])]
+        else:
+            lits = [self._new() for _ in range(math.ceil(math.log2(size)))]  # lits[k]: bit k of x - lb
+            self.clauses += self._bits_at_most(lits, size - 1)
+        self.encoded[id(x)] = (x, encoding, lits)
+
+    def _amo(self, lits):
+        encoding = EncType.pairwise if len(lits) <= 6 else EncType.seqcounter
+        return CardEnc.atmost(lits, 1, vpool=self.pool, encoding=encoding).clauses
+
+    def _bits_at_most(self, bits, ub):
+        # bits <= ub: for each 0-bit k of ub, bit k and all higher 1-bits of ub can not all be set
+        ones = [k for k in range(len(bits)) if ub >> k & 1]
+        return [[-bits[k]] + [-bits[j] for j in ones if j > k] for k in range(len(bits)) if not ub >> k & 1]
+
+    def kind(self, x):
+        # the encoding of x, a Boolean is its own direct encoding
+        return "direct" if isinstance(x, _BoolVarImpl) else self.encoded[id(x)][1]
+
+    def eq(self, x, v):
+        """The literals whose conjunction is x == v ([] is true), or None when v is not in the domain of x."""
+        if isinstance(x, _BoolVarImpl):
+            return None if v not in (0, 1) else [self._bool(x) if v else -self._bool(x)]
+        _, encoding, lits = self.encoded[id(x)]
+        if not x.lb <= v <= x.ub:
+            return None
+        i = v - x.lb
+        if encoding == "direct":
+            return [lits[i]]
+        if encoding == "order":
+            return ([lits[i - 1]] if i > 0 else []) + ([-lits[i]] if i < len(lits) else [])
+        return [b if i >> k & 1 else -b for k, b in enumerate(lits)]
+
+    def term(self, x, w=1):
+        # w * x as (weighted literals, constant)
+        if isinstance(x, (_BoolVarImpl, NegBoolView)):
+            return [(w, self._bool(x))], 0
+        _, encoding, lits = self.encoded[id(x)]
+        if encoding == "direct":
+            return [(w * i, b) for i, b in enumerate(lits) if i > 0], w * x.lb
+        if encoding == "order":
+            return [(w, b) for b in lits], w * x.lb
+        return [(w * 2 ** k, b) for k, b in enumerate(lits)], w * x.lb
+
+    def value(self, x, model):
+        true = {lit for lit in model if lit > 0}
+        terms, k = self.term(x)
+        return k + sum(w for w, b in terms if b in true)
+
+    # --- constraints
+
+    def _false(self):
+        f = self._new()
+        self.clauses += [[f], [-f]]
+
+    def _implies(self, antecedent, consequent):
+        # conjunction of literals -> conjunction of literals (None is false)
+        if antecedent is None:
+            return
+        if consequent is None and len(antecedent) == 0:
+            self._false()
+        elif consequent is None:
+            self.clauses.append([-a for a in antecedent])
+        else:
+            self.clauses += [[-a for a in antecedent] + [c] for c in consequent]
+
+    def _encode_constraint(self, c):
+        if isinstance(c, (bool, cp.BoolVal)) or is_num(c):
+            if not c:
+                self._false()
+        elif isinstance(c, (_BoolVarImpl, NegBoolView)):
+            self.clauses.append([self._bool(c)])
+        elif isinstance(c, AllDifferent):
+            self._alldifferent([_affine(a) for a in c.args])
+        elif isinstance(c, Comparison) and isinstance(c.args[0], Element):
+            self._element(c)
+        elif isinstance(c, Comparison) and _affine(c.args[0]) is not None and _affine(c.args[1]) is not None:
+            (x, cx), (y, cy) = _affine(c.args[0]), _affine(c.args[1])
+            if c.name == "!=":
+                self._neq((x, cx), (y, cy))
+            elif c.name == "==":
+                self._equal((x, cx), (y, cy))
+            else:
+                self._linear(Operator("sub", list(c.args)), c.name, 0)
+        elif isinstance(c, Comparison) and c.name == "!=" and _difference(*c.args) is not None:
+            x, y, k = _difference(*c.args)
+            self._neq((x, 0), (y, k))
+        elif isinstance(c, Comparison) and is_num(c.args[1]):
+            self._linear(c.args[0], c.name, c.args[1])
+        elif isinstance(c, Operator) and c.name == "and":
+            for a in c.args:
+                self._encode_constraint(a)
+        elif isinstance(c, Operator) and c.name == "or" and all(isinstance(a, (_BoolVarImpl, NegBoolView)) for a in c.args):
+            self.clauses.append([self._bool(a) for a in c.args])
+        else:
+            raise NotSupportedError(f"No SAT encoding for {c}")
+
+    def _values(self, x, c):
+        return range(x.lb + c, x.ub + c + 1) if x is not None else [c]
+
+    def _eq_shifted(self, x, c, w):  # x + c == w
+        if x is None:
+            return [] if w == c else None
+        return self.eq(x, w - c)
+
+    def _neq(self, a, b):
+        (x, cx), (y, cy) = a, b
+        if x is not None and y is not None and x is not y and \
+                self.kind(x) == self.kind(y) == "log" and x.lb + cx == y.lb + cy:
+            # aligned bits: x != y iff some bit differs, d_k -> (x_k xor y_k)
+            bx, by = self.encoded[id(x)][2], self.encoded[id(y)][2]
+            diffs = []
+            for k in range(max(len(bx), len(by))):
+                d = self._new()
+                xk, yk = bx[k] if k < len(bx) else None, by[k] if k < len(by) else None
+                if xk is None or yk is None:  # compare with a 0-bit
+                    self.clauses.append([-d, xk or yk])
+                else:
+                    self.clauses += [[-d, xk, yk], [-d, -xk, -yk]]
+                diffs.append(d)
+            self.clauses.append(diffs)
+            return
+        for w in set(self._values(x, cx)) & set(self._values(y, cy)):
+            both = [self._eq_shifted(x, cx, w), self._eq_shifted(y, cy, w)]
+            if None not in both:
+                self._implies(both[0] + both[1], None)
+
+    def _equal(self, a, b):
+        for (x, cx), (y, cy) in [(a, b), (b, a)]:
+            for w in self._values(x, cx):
+                self._implies(self._eq_shifted(x, cx, w), self._eq_shifted(y, cy, w))
+
+    def _alldifferent(self, terms):
+        if any(t is None for t in terms):
+            raise NotSupportedError("AllDifferent over terms other than x + c")
+        if all(x is None or self.kind(x) == "direct" for x, _ in terms):
+            for w in set(v for x, c in terms for v in self._values(x, c)):
+                lits = [self._eq_shifted(x, c, w) for x, c in terms]
+                if any(lit == [] for lit in lits):  # a constant takes w
+                    for lit in lits:
+                        if lit is not None and lit != []:
+                            self.clauses.append([-lit[0]])
+                    continue
+                self.clauses += self._amo([lit[0] for lit in lits if lit is not None])
+        else:
+            for a, b in itertools.combinations(terms, 2):
+                self._neq(a, b)
+
+    def _element(self, c):
+        arr, idx = c.args[0].args
+        if c.name != "==":
+            raise NotSupportedError(f"No SAT encoding for {c}, only Element(...) == y")
+        y = _affine(c.args[1])
+        if y is None or any(_affine(a) is None for a in arr):
+            raise NotSupportedError(f"No SAT encoding for {c}, only over x + c terms")
+        for i in range(idx.lb, idx.ub + 1):
+            guard = self.eq(idx, i)
+            if not 0 <= i < len(arr):
+                self._implies(guard, None)
+                continue
+            a = _affine(arr[i])
+            for w in self._values(*a):
+                self._implies(None if guard is None or self._eq_shifted(*a, w) is None
+                              else guard + self._eq_shifted(*a, w), self._eq_shifted(*y, w))
+
+    def _linear(self, lhs, cmp, rhs):
+        # sum over bools, products of two bools and ints (weighted) <cmp> rhs
+        weighted = list(zip(*lhs.args)) if isinstance(lhs, Operator) and lhs.name == "wsum" else [(1, lhs)]
+        terms, k = [], 0
+        for w, a in weighted:
+            if is_num(a):
+                k += w * a
+            elif isinstance(a, Operator) and a.name == "sum":
+                weighted += [(w, b) for b in a.args]
+            elif isinstance(a, Operator) and a.name == "sub":
+                weighted += [(w, a.args[0]), (-w, a.args[1])]
+            elif isinstance(a, Operator) and a.name == "-" and len(a.args) == 1:
+                weighted.append((-w, a.args[0]))
+            elif isinstance(a, Expression) and a.name == "mul" and is_num(a.args[0]):
+                weighted.append((w * a.args[0], a.args[1]))
+            elif isinstance(a, Expression) and a.name == "mul" and \
+                    all(isinstance(b, (_BoolVarImpl, NegBoolView)) for b in a.args):
+                p, q = (self._bool(b) for b in a.args)
+                both = self._new()  # both <-> p and q
+                self.clauses += [[-both, p], [-both, q], [both, -p, -q]]
+                terms.append((w, both))
+            elif isinstance(a, (_BoolVarImpl, NegBoolView, _IntVarImpl)):
+                t, kk = self.term(a, w)
+                terms += t
+                k += kk
+            else:
+                raise NotSupportedError(f"No SAT encoding for the term {a} of {lhs}")
+        rhs -= k
+        lits, weights = [], []
+        for w, b in terms:  # positive weights: w*b = w + |w|*~b for w < 0
+            if w < 0:
+                rhs -= w
+                w, b = -w, -b
+            if w != 0:
+                lits.append(b)
+                weights.append(w)
+        if cmp == "<":
+            cmp, rhs = "<=", rhs - 1
+        elif cmp == ">":
+            cmp, rhs = ">=", rhs + 1
+        if cmp == "!=":
+            raise NotSupportedError(f"No SAT encoding for a linear {cmp}, only for x - y != k")
+        if (cmp in ("<=", "==") and rhs < 0) or (cmp in (">=", "==") and rhs > sum(weights)):
+            self._false()
+            return
+        if len(lits) == 0 or (cmp == "<=" and rhs >= sum(weights)) or (cmp == ">=" and rhs <= 0):
+            return
+        method = {"==": "equals", "<=": "atmost", ">=": "atleast"}[cmp]
+        if all(w == 1 for w in weights):
+            enc = getattr(CardEnc, method)(lits, rhs, vpool=self.pool, encoding=EncType.totalizer)
+        else:
+            enc = getattr(PBEnc, method)(lits, weights, rhs, vpool=self.pool)
+        self.clauses += enc.clauses
+
+    # --- solving
+
+    def to_dimacs(self, f):
+        f.write(f"p cnf {self.pool.top} {len(self.clauses)}\n")
+        f.writelines(" ".join(map(str, c)) + " 0\n" for c in self.clauses)
+
+    def solve(self, backend="glucose4", time_limit=None):
+        """
+        Solve the clauses with 'backend': the name of a pysat solver, or a function (clauses, n_vars) -> model
+        (a list of literals, as pysat returns), False if unsatisfiable, or None if it gave up (e.g. out of time).
+        On success, the values are written back into the cpmpy variables. Returns whether a solution was found,
+        status() tells an unsatisfiable CNF (UNSATISFIABLE) from a time-out (UNKNOWN).
+        """
+        t0 = time.perf_counter()
+        if callable(backend):
+            model = backend(self.clauses, self.pool.top)
+            found = None if model is None else model is not False
+        else:
+            from pysat.solvers import Solver
+            with Solver(name=backend, bootstrap_with=self.clauses) as s:
+                if time_limit is None:
+                    found = s.solve()
+                else:  # interrupt after 'time_limit' seconds, then solve_limited returns None
+                    timer = threading.Timer(time_limit, s.interrupt)
+                    timer.start()
+                    found = s.solve_limited(expect_interrupt=True)
+                    timer.cancel()
+                model = s.get_model() if found else None
+        self._status = SolverStatus(backend if isinstance(backend, str) else "cnf")
+        self._status.runtime = time.perf_counter() - t0
+        self._status.exitstatus = {True: ExitStatus.FEASIBLE, False: ExitStatus.UNSATISFIABLE}.get(found, ExitStatus.UNKNOWN)
+        if not found:
+            return False
+        for x, _, _ in self.encoded.values():
+            x._value = self.value(x, model)
+        true = set(model)
+        for b, lit in self.bools.values():
+            b._value = lit in true
+        return True
+
+    def status(self):
+        # as for the cpmpy solvers: exitstatus (NOT_RUN before solve()) and runtime of the last solve()
+        return self._status
+
+
+def _affine(expr):
+    # expr as (variable or None, constant): x, x + c, x - c, c; None for anything else
+    if is_num(expr):
+        return None, int(expr)
+    if isinstance(expr, (_IntVarImpl, _BoolVarImpl)) and not isinstance(expr, NegBoolView):
+        return expr, 0
+    if isinstance(expr, Operator) and expr.name in ("sum", "sub") and len(expr.args) == 2:
+        x, c = expr.args
+        if is_num(x):
+            x, c = c, x
+            if expr.name == "sub":
+                return None
+        if isinstance(x, _IntVarImpl) and is_num(c):
+            return x, int(c) if expr.name == "sum" else -int(c)
+    return None
+
+
+def _unit_terms(expr, sign=1):
+    # expr as a sum of +/- variables and a constant: ([(sign, variable)], constant), None for anything else
+    if is_num(expr):
+        return [], sign * int(expr)
+    if isinstance(expr, _IntVarImpl) and not isinstance(expr, NegBoolView):
+        return [(sign, expr)], 0
+    if isinstance(expr, Operator) and expr.name in ("sum", "sub", "-"):
+        signs = [1, -1] if expr.name == "sub" else [-1] if expr.name == "-" else [1] * len(expr.args)
+        terms, k = [], 0
+        for s, a in zip(signs, expr.args):
+            t = _unit_terms(a, sign * s)
+            if t is None:
+                return None
+            terms += t[0]
+            k += t[1]
+        return terms, k
+    return None
+
+
+def _difference(lhs, rhs):
+    # lhs <cmp> rhs as x <cmp> y + k: (x, y, k), None when it is not a difference of two variables
+    left, right = _unit_terms(lhs), _unit_terms(rhs, -1)
+    if left is None or right is None:
+        return None
+    terms = left[0] + right[0]
+    if len(terms) != 2 or terms[0][0] == terms[1][0] or terms[0][1] is terms[1][1]:
+        return None
+    (_, x), (_, y) = sorted(terms, key=lambda t: -t[0])
+    return x, y, -(left[1] + right[1])
+
+
+if __name__ == "__main__":
+    from instances import nqueens
+
+    model, Row = nqueens(12)
+    for encoding in ["auto", "direct", "order", "log"]:
+        cnf = CNF(model, encoding)
+        assert cnf.solve()
+        assert all(c.value() for c in flatlist(model.constraints))
+        print(f"{encoding:6s}: {cnf.pool.top} variables, {len(cnf.clauses)} clauses, Row = {Row.value()}")
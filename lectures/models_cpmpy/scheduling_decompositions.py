@@ -0,0 +1,82 @@
+import numpy as np
+import cpmpy as cp
+
+# The scheduling models of E6a: 'nr_tasks' tasks with 'durations', at most 'capacity' in parallel,
+# all within [0..t_max], minimise the makespan. Each returns (model, start).
+
+
+def scheduling_model_global(durations, t_max, capacity):
+    # the Cumulative global constraint
+    nr_tasks = len(durations)
+    start = cp.intvar(0, t_max, shape=nr_tasks, name="start")
+    model = cp.Model(
+        cp.Cumulative(start, durations, start + durations, 1, capacity),
+        start + durations <= t_max,
+    )
+    model.minimize(cp.max(start + durations))
+    return model, start
+
+
+def scheduling_model_time_resource(durations, t_max, capacity):
+    # B[i,t]: task i is active at time t, O(nr_tasks * t_max) Booleans
+    nr_tasks = len(durations)
+    start = cp.intvar(0, t_max, shape=nr_tasks, name="start")
+    B = cp.boolvar(shape=(nr_tasks, t_max), name="B")
+    model = cp.Model(start + durations <= t_max)
+    for t in range(t_max):
+        model.add(B[:, t] == (start <= t) & ~(start <= t - durations))
+        model.add(cp.sum(B[:, t]) <= capacity)
+    model.minimize(cp.max(start + durations))
+    return model, start
+
+
+def scheduling_model_task_resource(durations, t_max, capacity):
+    # B[i,j]: task i is active when task j starts, O(nr_tasks^2) Booleans
+    nr_tasks = len(durations)
+    start = cp.intvar(0, t_max, shape=nr_tasks, name="start")
+    B = cp.boolvar(shape=(nr_tasks, nr_tasks), name="B")
+    model = cp.Model(start + durations <= t_max)
+    for i in range(nr_tasks):
+        for j in range(nr_tasks):
+            if i != j:
+                model.add(B[i, j] == ((start[i] <= start[j]) & (start[j] < start[i] + durations[i])))
+            else:
+                model.add(B[i, j] == 1)
+    for j in range(nr_tasks):
+        model.add(cp.sum(B[:, j]) <= capacity)
+    model.minimize(cp.max(start + durations))
+    return model, start
+
+
+def scheduling_model_event(durations, t_max, capacity, release=None):
+    """
+    Event-based decomposition: the resource is only checked at the start of each task.
+
+    Start domains are tight ([release..t_max-d], release times are optional), and an overlap literal
+    is only created for the pairs (i,j) where task i can still be running when task j starts.
+    The literals are only implied by the overlap (the other direction is not needed for the capacity check).
+    """
+    durations = np.asarray(durations)
+    nr_tasks = len(durations)
+    est = np.zeros(nr_tasks, dtype=int) if release is None else np.asarray(release)  # earliest start
+    lst = t_max - durations  # latest start
+    start = cp.cpm_array([cp.intvar(est[i], lst[i], name=f"start[{i}]") for i in range(nr_tasks)])
+
+    model = cp.Model()
+    active = [[] for _ in range(nr_tasks)]  # active[j]: literals of the tasks running when j starts
+    for j in range(nr_tasks):
+        for i in range(nr_tasks):
+            # task i can cover start j only if [est_i, lst_i + d_i) intersects [est_j, lst_j]
+            if i == j or durations[i] == 0 or est[i] > lst[j] or est[j] >= lst[i] + durations[i]:
+                continue
+            b = cp.boolvar(name=f"B[{i},{j}]")
+            if i < j:  # ties in start time: count task i at the start of j, not the other way around
+                model.add(((start[i] <= start[j]) & (start[j] < start[i] + durations[i])).implies(b))
+            else:
+                model.add(((start[i] < start[j]) & (start[j] < start[i] + durations[i])).implies(b))
+            active[j].append(b)
+        if len(active[j]) >= capacity:
+            model.add(cp.sum(active[j]) <= capacity - 1)  # task j itself takes one unit
+
+    model.minimize(cp.max(start + durations))
+    return model, start
@@ -0,0 +1,148 @@
+import os
+import sys
+import time
+import runpy
+import signal
+import builtins
+import tempfile
+import traceback
+import multiprocessing as mp
+from multiprocessing.connection import wait
+
+# warm up: the forked workers inherit these modules already imported, numpy and ortools are not used here
+t_start = time.perf_counter()
+import numpy  # noqa: F401
+import cpmpy as cp
+import ortools.sat.python.cp_model  # noqa: F401
+WARM_IMPORT_TIME = time.perf_counter() - t_start
+
+
+def _timed(func, counter, key):
+    # wrap 'func' so that the time spent in it is added to counter[key] (outermost call only)
+    depth = [0]
+
+    def wrapper(*args, **kwargs):
+        depth[0] += 1
+        t0 = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            depth[0] -= 1
+            if depth[0] == 0:
+                counter[key] += time.perf_counter() - t0
+    return wrapper
+
+
+def _run(script, outfile, conn):
+    # runs in a forked worker: execute the script as __main__, with its output in 'outfile'
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()  # own process group, so a time-out also kills the processes the script started
+    fd = os.open(outfile, os.O_WRONLY)
+    os.dup2(fd, 1)
+    os.dup2(fd, 2)
+    os.close(fd)
+    # sys.stdout/stderr may not write to fds 1 and 2 (e.g. pytest's capture objects), so rebind them
+    sys.stdout = os.fdopen(1, "w", buffering=1, closefd=False)
+    sys.stderr = os.fdopen(2, "w", buffering=1, closefd=False)
+    folder = os.path.dirname(os.path.abspath(script))
+    os.chdir(folder)
+    sys.path.insert(0, folder)
+    sys.argv = [script]
+
+    timings = dict(imports=0.0, solve=0.0)
+    builtins.__import__ = _timed(builtins.__import__, timings, "imports")
+    for solver in cp.SolverLookup.base_solvers():
+        solver[1].solve = _timed(solver[1].solve, timings, "solve")
+
+    t0 = time.perf_counter()
+    code = 0
+    try:
+        runpy.run_path(script, run_name="__main__")
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    total = time.perf_counter() - t0
+    timings["build"] = total - timings["imports"] - timings["solve"]  # everything else: modeling, transforming, printing
+    sys.stdout.flush()
+    sys.stderr.flush()
+    conn.send((code, timings))  # over its own pipe: killing another worker can not break it
+    conn.close()
+    os._exit(code)
+
+
+def run_scripts(scripts, n_workers=None, timeout=120):
+    """
+    Run the scripts concurrently, each in a worker forked from this (already warm) interpreter.
+    A script that runs longer than 'timeout' seconds is killed and fails.
+
+    Returns a dictionary: script -> dict(returncode, output, wall, imports, build, solve)
+    """
+    ctx = mp.get_context("fork" if "fork" in mp.get_all_start_methods() else None)
+    n_workers = n_workers or os.cpu_count()
+    todo = list(scripts)
+    running = {}  # script -> (process, receiving end of its pipe, start time, output file)
+    done = {}
+
+    def finish(script, returncode, timings):
+        p, recv, start, outfile = running.pop(script)
+        p.join()
+        recv.close()
+        with open(outfile) as f:
+            output = f.read()
+        os.remove(outfile)
+        done[script] = dict(returncode=returncode, output=output, wall=time.perf_counter() - start, **timings)
+
+    while len(todo) > 0 or len(running) > 0:
+        while len(todo) > 0 and len(running) < n_workers:
+            script = todo.pop(0)
+            fd, outfile = tempfile.mkstemp(suffix=".out")
+            os.close(fd)
+            recv, send = ctx.Pipe(duplex=False)
+            p = ctx.Process(target=_run, args=(script, outfile, send))  # not daemonic, scripts may start processes too
+            p.start()
+            send.close()  # only the worker writes
+            running[script] = (p, recv, time.perf_counter(), outfile)
+
+        ready = wait([recv for _, recv, _, _ in running.values()], timeout=0.1)
+        for script, (p, recv, start, outfile) in list(running.items()):
+            if recv in ready:
+                try:
+                    code, timings = recv.recv()
+                except EOFError:  # crashed hard, without sending a result
+                    p.join()
+                    code, timings = p.exitcode, dict(imports=None, build=None, solve=None)
+                finish(script, code, timings)
+            elif time.perf_counter() - start > timeout:
+                try:
+                    os.killpg(p.pid, signal.SIGKILL)
+                except (AttributeError, ProcessLookupError, PermissionError):  # no process groups, or not yet its own
+                    p.kill()
+                finish(script, f"timeout after {timeout}s", dict(imports=None, build=None, solve=None))
+
+    return done
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Run all CPMpy scripts in this folder concurrently, with timings")
+    parser.add_argument("-j", "--workers", type=int, default=None)
+    parser.add_argument("--timeout", type=float, default=120)
+    args = parser.parse_args()
+
+    folder = os.path.dirname(os.path.abspath(__file__))
+    scripts = sorted(f for f in os.listdir(folder)
+                     if f.endswith(".py") and f != os.path.basename(__file__) and not f.startswith("test_"))
+
+    print(f"warm imports (numpy, cpmpy, ortools): {WARM_IMPORT_TIME:.2f}s")
+    t0 = time.perf_counter()
+    results = run_scripts([os.path.join(folder, s) for s in scripts], n_workers=args.workers, timeout=args.timeout)
+    fmt = lambda t: "    -  " if t is None else f"{t:6.2f}s"
+    for script in scripts:
+        r = results[os.path.join(folder, script)]
+        status = "ok" if r["returncode"] == 0 else f"FAILED ({r['returncode']})"
+        print(f"{script:28s} wall {fmt(r['wall'])}  import {fmt(r['imports'])}  build {fmt(r['build'])}  "
+              f"solve {fmt(r['solve'])}  {status}")
+    print(f"total wall-clock: {time.perf_counter() - t0:.2f}s")
+    sys.exit(any(r["returncode"] != 0 for r in results.values()))
@@ -1,5 +1,84 @@
+import cpmpy as cp
 from cpmpy.tools.explain.mus import optimal_mus
+from cpmpy.transformations.get_variables import get_variables
 
 def smus(soft, hard=[], solver="ortools", hs_solver="ortools"):
     return optimal_mus(soft, hard=hard, weights=None, solver=solver,
-    hs_solver=hs_solver)
\ No newline at end of file
+    hs_solver=hs_solver)
+
+
+class ExplanationSession:
+    """
+    Smallest MUSes of many related soft sets over the same hard constraints (implicit hitting sets, as in optimal_mus).
+
+    The SAT oracle and the hitting-set solver are kept between queries. Every soft constraint gets one
+    indicator literal the first time it is seen (by its string), the literals outside the current query are
+    assumed false in the hitting-set solver. Each correction set found stays in the hitting-set solver,
+    guarded by a literal, together with the solution it came from. When a later query brings new soft
+    constraints, the ones that solution violates are recorded: the correction set is reused (its guard assumed)
+    for every query that contains none of them.
+    """
+
+    def __init__(self, hard=[], solver="ortools", hs_solver="ortools"):
+        self.oracle = cp.SolverLookup.get(solver)
+        self.oracle += hard
+        self.hs_solver = cp.SolverLookup.get(hs_solver)
+        self.lits = dict()  # str(soft constraint) -> indicator literal
+        self.soft = dict()  # indicator literal -> soft constraint
+        self.corrections = []  # (solution, guard, literals added later that the solution violates)
+        self.oracle_calls = 0
+
+    def smus(self, soft):
+        new = [c for c in soft if str(c) not in self.lits]
+        for c in new:
+            a = cp.boolvar()
+            self.oracle += a.implies(c)
+            self.lits[str(c)] = a
+            self.soft[a] = c
+        if len(new) > 0:
+            for solution, _, violated in self.corrections:
+                violated.update(self.lits[str(c)] for c in new if not _holds(c, solution))
+
+        query = [self.lits[str(c)] for c in soft]
+        in_query = set(query)
+        others = [~a for a in self.soft if a not in in_query]
+        self.hs_solver.minimize(cp.sum(query))
+        while True:
+            guards = [g for _, g, violated in self.corrections if violated.isdisjoint(in_query)]
+            assert self.hs_solver.solve(assumptions=guards + others) is True, "The soft constraints should be UNSAT"
+            hitting_set = [a for a in query if a.value()]
+            self.oracle_calls += 1
+            if self.oracle.solve(assumptions=hitting_set) is False:
+                return [self.soft[a] for a in hitting_set]
+
+            # grow to everything the solution satisfies, then look for more disjoint correction sets (as optimal_mus)
+            sat_subset = []
+            while True:
+                correction = [a for a in self._add_correction() if a in in_query]
+                assert len(correction) > 0, "The soft constraints should be UNSAT"
+                sat_subset += correction
+                self.oracle_calls += 1
+                if self.oracle.solve(assumptions=sat_subset) is False:
+                    break
+
+    def _add_correction(self):
+        # correction set of the oracle's current solution, over all soft constraints seen so far
+        correction = [a for a, c in self.soft.items() if not c.value()]
+        guard = cp.boolvar()
+        self.hs_solver += guard.implies(cp.sum(correction) >= 1)
+        self.corrections.append(({v: v.value() for v in self.oracle.user_vars}, guard, set()))
+        return correction
+
+
+def _holds(c, solution):
+    # value of 'c' in a stored solution, False if it has variables the solution does not know (always safe)
+    variables = get_variables(c)
+    if any(v not in solution for v in variables):
+        return False
+    current = [v._value for v in variables]
+    for v in variables:
+        v._value = solution[v]
+    value = c.value()
+    for v, val in zip(variables, current):
+        v._value = val
+    return bool(value)
@@ -0,0 +1,52 @@
+import time
+from collections import deque
+
+import cpmpy as cp
+
+
+def solution_stream(model, project, solver="ortools", solution_limit=None, time_limit=None):
+    """
+    Lazily yield the solutions of 'model', projected onto the variables in 'project' (as a numpy array of values).
+
+    'model' is a cp.Model, which is posted to a new solver once, or an existing solver object.
+    After each solution only a blocking clause over 'project' is added, so breaking out of the loop
+    keeps the solver state; calling it again with the same solver continues the enumeration.
+    The solver grows by one clause per solution: to count many solutions in constant memory, use count_solutions().
+    """
+    s = cp.SolverLookup.get(solver, model) if isinstance(model, cp.Model) else model
+    project = cp.cpm_array(project)
+    end = None if time_limit is None else time.time() + time_limit
+
+    count = 0
+    while solution_limit is None or count < solution_limit:
+        remaining = None
+        if end is not None:
+            remaining = end - time.time()
+            if remaining <= 0:
+                return  # time budget used up
+        if not s.solve(time_limit=remaining):
+            return  # no more solutions (or timeout)
+
+        values = project.value()
+        s += cp.any(project.flatten() != values.flatten())  # block this projection only
+        count += 1
+        yield values
+
+
+def count_solutions(model, project=None, solver="ortools", solution_limit=None, time_limit=None, buffer_size=10):
+    """
+    Count solutions while keeping only the last 'buffer_size' ones in memory, projected onto 'project'
+    (default: all variables).
+    Uses the solver's native enumeration with a solution callback (ortools), so nothing is added to the solver
+    and memory stays constant however many solutions are counted; solvers without native enumeration fall back
+    to cpmpy's solveAll, which adds a blocking clause per solution.
+    Native enumeration has no projection: solutions that only differ outside 'project' are counted separately,
+    use solution_stream() to enumerate distinct projections.
+    Returns the number of solutions and the buffered ones.
+    """
+    last = deque(maxlen=buffer_size)
+    s = cp.SolverLookup.get(solver, model) if isinstance(model, cp.Model) else model
+    variables = cp.cpm_array(list(s.user_vars) if project is None else project)
+    count = s.solveAll(display=lambda: last.append(variables.value()),
+                       solution_limit=solution_limit, time_limit=time_limit)
+    return count, list(last)
@@ -0,0 +1,107 @@
+import sys
+import time
+import argparse
+import contextlib
+import multiprocessing as mp
+
+import numpy as np
+import cpmpy as cp
+
+
+def default_solver():
+    # incremental SAT with fast assumptions if pysat is installed, else ortools
+    return "pysat" if "pysat" in cp.SolverLookup.solvernames() else "ortools"
+
+
+class SudokuSolver:
+    """
+    The puzzle-independent part of the Sudoku model, posted once to a persistent solver.
+    The givens of each puzzle are passed as assumptions on Boolean 'cell has value' literals.
+    """
+
+    def __init__(self, solver=None, **solver_args):
+        self.grid = cp.intvar(1, 9, shape=(9, 9), name="grid")
+        self.is_val = cp.boolvar(shape=(9, 9, 9), name="is_val")  # is_val[r,c,v-1] <-> grid[r,c] == v
+        self.solver_args = solver_args
+        self.s = cp.SolverLookup.get(solver or default_solver())
+        self.s += [cp.AllDifferent(row) for row in self.grid]
+        self.s += [cp.AllDifferent(col) for col in self.grid.T]
+        self.s += [cp.AllDifferent(self.grid[i:i + 3, j:j + 3]) for i in range(0, 9, 3) for j in range(0, 9, 3)]
+        self.s += [self.is_val[r, c, v - 1] == (self.grid[r, c] == v)
+                   for r in range(9) for c in range(9) for v in range(1, 10)]
+
+    def solve(self, given):
+        # 'given' is a 9x9 array with 0 for the empty cells, returns the solved grid or None
+        r, c = np.nonzero(given)
+        assumptions = list(self.is_val[r, c, given[r, c] - 1])
+        if self.s.solve(assumptions=assumptions, **self.solver_args):
+            return self.grid.value()
+        return None
+
+
+def parse(line):
+    # one puzzle per line: 81 characters, '0' or '.' for the empty cells
+    puzzle = line.strip().replace(".", "0")
+    if len(puzzle) != 81 or not puzzle.isdigit():
+        raise ValueError(f"Expected 81 digits or '.', got {len(puzzle)} characters: {line.strip()!r}")
+    return np.array([int(ch) for ch in puzzle]).reshape(9, 9)
+
+
+def format_solution(grid):
+    return "" if grid is None else "".join(str(v) for v in grid.flat)  # empty line if no solution
+
+
+_worker = None  # one persistent solver per worker process
+
+
+def _init_worker(solver, solver_args):
+    global _worker
+    _worker = SudokuSolver(solver, **solver_args)
+
+
+def _solve_line(line):
+    return format_solution(_worker.solve(parse(line)))
+
+
+def solve_stream(lines, n_jobs=1, solver=None, chunksize=64, **solver_args):
+    """
+    Lazily yield one solution line (or "" when UNSAT) per puzzle line, in the input order.
+    With n_jobs > 1, puzzles are fanned out over a process pool with one solver per worker.
+    'solver' defaults to default_solver().
+    """
+    solver = solver or default_solver()
+    lines = (line for line in lines if line.strip())
+    if n_jobs == 1:
+        _init_worker(solver, solver_args)
+        yield from map(_solve_line, lines)
+    else:
+        with mp.Pool(n_jobs, initializer=_init_worker, initargs=(solver, solver_args)) as pool:
+            yield from pool.imap(_solve_line, lines, chunksize=chunksize)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve many Sudoku puzzles, one 81-character line per puzzle")
+    parser.add_argument("puzzles", nargs="?", help="input file (default: a small built-in demo)")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    parser.add_argument("-j", "--jobs", type=int, default=1)
+    parser.add_argument("--solver", help="default: pysat if installed (incremental SAT, fast assumptions), else ortools")
+    args = parser.parse_args()
+    solver = args.solver or default_solver()
+    # single-threaded search per puzzle, parallelism comes from the pool
+    solver_args = dict(num_search_workers=1) if solver == "ortools" else dict()
+
+    with contextlib.ExitStack() as files:  # closes (and flushes) the files, also on errors
+        if args.puzzles:
+            lines = files.enter_context(open(args.puzzles))
+        else:  # the puzzle of T01_sudoku.py, a few times
+            lines = ["800000000003600000070090200050007000000045700000100030001000068008500010090000400"] * 20
+        out = files.enter_context(open(args.output, "w")) if args.output else sys.stdout
+
+        t0 = time.perf_counter()
+        n = 0
+        for solution in solve_stream(lines, n_jobs=args.jobs, solver=solver, **solver_args):
+            out.write(solution + "\n")
+            n += 1
+        out.flush()
+    elapsed = time.perf_counter() - t0
+    print(f"{n} puzzles in {elapsed:.2f}s: {n / elapsed:.1f} puzzles/s", file=sys.stderr)
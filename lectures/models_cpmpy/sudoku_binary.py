@@ -30,8 +30,6 @@ model = cp.Model(
      for i in [0, 3, 6] for j in [0, 3, 6]]
 )
 
-model.solve()
-
 # Solve and print
 if model.solve():
     print(model.status())
@@ -0,0 +1,231 @@
+from collections import Counter
+
+import numpy as np
+import networkx as nx
+import cpmpy as cp
+from cpmpy.expressions.core import Expression
+from cpmpy.expressions.utils import flatlist, is_num
+from cpmpy.expressions.variables import _NumVarImpl, _BoolVarImpl, NegBoolView
+from cpmpy.transformations.get_variables import get_variables_model
+
+# the order of the arguments of these does not matter
+commutative = {"sum", "and", "or", "mul", "==", "!=", "alldifferent", "allequal", "max", "min", "xor", "nvalue"}
+# the order of the elements of their list arguments does not matter
+multiset = {"count", "among", "nvalue"}
+# constraints that only compare variables, so any permutation of their values is a symmetry
+value_agnostic = {"==", "!=", "alldifferent", "allequal"}
+
+
+def model_graph(model):
+    """
+    Coloured graph of a model: one node per variable, per (sub)expression and per value,
+    such that the automorphisms that map variables to variables and values to values are symmetries of the model.
+
+    Variables are coloured by their domain, expressions by their name and constant arguments. Arguments of
+    non-commutative expressions hang below position nodes. Value nodes are only linked to the variables that
+    occur exclusively in value-agnostic constraints (==, !=, alldifferent, ... between variables),
+    so that only their values can be permuted.
+
+    Returns the graph, the variables and the values (the node of variable i is ("var", i), of value v ("value", v)).
+    """
+    variables = list(get_variables_model(model))
+    index = {id(v): i for i, v in enumerate(variables)}
+    cons = flatlist(model.constraints)
+    agnostic = _value_agnostic_vars(model, cons, variables, index)
+
+    graph = nx.Graph()
+    for i, v in enumerate(variables):
+        graph.add_node(("var", i), colour=("var", isinstance(v, _BoolVarImpl), v.lb, v.ub, i in agnostic))
+    values = sorted({val for i in agnostic for val in range(variables[i].lb, variables[i].ub + 1)})
+    for val in values:
+        graph.add_node(("value", val), colour=("value",))
+    for i in agnostic:
+        for val in range(variables[i].lb, variables[i].ub + 1):
+            graph.add_edge(("var", i), ("value", val))
+
+    def add(expr, ordered=True):  # returns the node of 'expr', 'ordered': whether a list argument's order matters
+        if isinstance(expr, NegBoolView):
+            node = ("expr", len(graph))
+            graph.add_node(node, colour=("not",))
+            graph.add_edge(node, add(expr._bv))
+            return node
+        if isinstance(expr, _NumVarImpl):
+            return ("var", index[id(expr)])
+        if isinstance(expr, Expression):
+            name, args = expr.name, list(expr.args)
+        else:  # a list or array argument
+            name, args = "list" if ordered else "set", flatlist(expr) if isinstance(expr, np.ndarray) else list(expr)
+        if name == "wsum":  # weighted sum: one term node per (weight, variable)
+            args = [("term", w, e) for w, e in zip(*expr.args)]
+        constants = tuple(a if is_num(a) else None for a in args)
+        node = ("expr", len(graph))
+        graph.add_node(node, colour=(name, tuple(sorted(c for c in constants if c is not None))
+                                     if name in commutative or name == "set" else constants))
+        for pos, a in enumerate(args):
+            if is_num(a):
+                continue
+            if isinstance(a, tuple) and len(a) == 3 and a[0] == "term":
+                child = ("expr", len(graph))
+                graph.add_node(child, colour=("term", a[1]))
+                graph.add_edge(child, add(a[2]))
+            else:
+                child = add(a, ordered=name not in multiset)
+            if name not in commutative and name != "set":
+                pos_node = ("expr", len(graph))
+                graph.add_node(pos_node, colour=("pos", name, pos))
+                graph.add_edge(node, pos_node)
+                node_to = pos_node
+            else:
+                node_to = node
+            graph.add_edge(node_to, child)
+        return node
+
+    for c in cons:
+        root = add(c)
+        graph.nodes[root]["colour"] = ("constraint",) + graph.nodes[root]["colour"]
+    if model.objective_ is not None:
+        root = add(model.objective_)
+        graph.nodes[root]["colour"] = ("objective", model.objective_is_min) + graph.nodes[root]["colour"]
+    return graph, variables, values
+
+
+def _value_agnostic_vars(model, cons, variables, index):
+    # indices of the integer variables that only occur in value-agnostic constraints between variables
+    bad = set()
+    if model.objective_ is not None:
+        bad |= {index[id(v)] for v in get_variables_model(cp.Model(model.objective_ >= 0))}
+    groups = []
+    for c in cons:
+        vs = [index[id(v)] for v in get_variables_model(cp.Model(c))]
+        if isinstance(c, Expression) and c.name in value_agnostic and \
+                all(isinstance(a, _NumVarImpl) and not isinstance(a, _BoolVarImpl) for a in flatlist(c.args)):
+            groups.append(vs)
+        else:
+            bad |= set(vs)
+    changed = True
+    while changed:  # a constraint with a 'bad' variable makes all of its variables bad
+        changed = False
+        for vs in groups:
+            if any(i in bad for i in vs) and not all(i in bad for i in vs):
+                bad |= set(vs)
+                changed = True
+    return {i for vs in groups for i in vs} - bad
+
+
+def _refine(adj, colour):
+    # colour refinement (1-dimensional Weisfeiler-Leman) to the coarsest stable partition;
+    # colours are renumbered canonically, so that refining isomorphic colourings gives corresponding colours
+    n_colours = len(set(colour))
+    while True:
+        signature = [(colour[n], tuple(sorted(colour[m] for m in adj[n]))) for n in range(len(adj))]
+        ids = {sig: i for i, sig in enumerate(sorted(set(signature)))}
+        colour = [ids[sig] for sig in signature]
+        if len(ids) == n_colours:
+            return colour
+        n_colours = len(ids)
+
+
+def _individualise(colour, n):
+    # node n gets a colour of its own, just before the rest of its cell
+    return [2 * c + (0 if m == n else 1) for m, c in enumerate(colour)]
+
+
+def _find_isomorphism(adj, col1, col2):
+    # individualisation-refinement: a permutation that maps colouring col1 onto col2 and preserves the edges, or None
+    col1, col2 = _refine(adj, col1), _refine(adj, col2)
+    cells = Counter(col1)
+    if cells != Counter(col2):
+        return None
+    if len(cells) == len(col1):  # discrete, a single candidate
+        where = {c: n for n, c in enumerate(col2)}
+        sigma = [where[c] for c in col1]
+        if all(sorted(sigma[m] for m in adj[n]) == sorted(adj[sigma[n]]) for n in range(len(adj))):
+            return sigma
+        return None
+    target = min((size, c) for c, size in cells.items() if size > 1)[1]  # smallest non-singleton cell
+    a = col1.index(target)
+    for b in (n for n, c in enumerate(col2) if c == target):
+        sigma = _find_isomorphism(adj, _individualise(col1, a), _individualise(col2, b))
+        if sigma is not None:
+            return sigma
+    return None
+
+
+def automorphism_generators(graph, points, max_generators=None):
+    """
+    Generators of the automorphisms of a coloured graph, as permutations of the 'points' (dict point -> image,
+    for the points that move).
+
+    Stabiliser chain: for each point p in turn, find an automorphism that maps p to each other point of its cell
+    that is not in its orbit yet (by individualisation-refinement, as nauty does), then fix p.
+    """
+    nodes = list(graph)
+    number = {n: i for i, n in enumerate(nodes)}
+    adj = [[number[m] for m in graph[n]] for n in nodes]
+    colours = {c: i for i, c in enumerate(sorted(set(nx.get_node_attributes(graph, "colour").values()), key=repr))}
+    colour = [colours[graph.nodes[n]["colour"]] for n in nodes]
+
+    generators = []
+    for p in points:
+        colour = _refine(adj, colour)
+        level = len(generators)  # the generators from here on fix all earlier points
+        orbit = {p}
+        for q in points:
+            if q in orbit or colour[number[q]] != colour[number[p]]:
+                continue
+            sigma = _find_isomorphism(adj, _individualise(colour, number[p]), _individualise(colour, number[q]))
+            if sigma is not None:
+                generators.append({n: nodes[sigma[number[n]]] for n in points if sigma[number[n]] != number[n]})
+                if max_generators is not None and len(generators) >= max_generators:
+                    return generators
+                orbit = _orbit(p, generators[level:])
+        colour = _individualise(colour, number[p])
+    return generators
+
+
+def _orbit(p, generators):
+    orbit, todo = {p}, [p]
+    while len(todo) > 0:
+        q = todo.pop()
+        for g in generators:
+            r = g.get(q, q)
+            if r not in orbit:
+                orbit.add(r)
+                todo.append(r)
+    return orbit
+
+
+def lex_leader(variables, generators, agnostic=()):
+    """
+    Lex-leader constraints: for each generator, the assignment to 'variables' is lexicographically
+    at most its image. A generator maps ("var", i) to ("var", j) and ("value", a) to ("value", b);
+    values are only permuted for the variables with index in 'agnostic'.
+    Positions that a generator does not change are left out, they compare equal anyway.
+    """
+    cons = []
+    for g in generators:
+        inverse = {j[1]: i[1] for i, j in g.items() if i[0] == "var"}
+        values = {a[1]: b[1] for a, b in g.items() if a[0] == "value"}
+        lhs, rhs = [], []
+        for j, x in enumerate(variables):
+            y = variables[inverse.get(j, j)]
+            if j in agnostic and len(values) > 0:  # y's value, permuted: linear in the (y == a) literals
+                y = y + cp.sum([(b - a) * (y == a) for a, b in values.items()])
+            if y is not x:
+                lhs.append(x)
+                rhs.append(y)
+        if len(lhs) > 0:
+            cons.append(cp.LexLessEq(lhs, rhs))
+    return cons
+
+
+def symmetry_breaking(model, max_generators=None):
+    """
+    Detect the symmetries of a model (automorphisms of model_graph) and return lex-leader constraints
+    for the first 'max_generators' generators (all by default), and the generators themselves.
+    """
+    graph, variables, values = model_graph(model)
+    points = [("var", i) for i in range(len(variables))] + [("value", v) for v in values]
+    generators = automorphism_generators(graph, points, max_generators)
+    agnostic = {i for i in range(len(variables)) if any(m[0] == "value" for m in graph[("var", i)])}
+    return lex_leader(variables, generators, agnostic), generators
@@ -1,9 +1,9 @@
 import cpmpy as cp
+from model_check import TracedModel, validate, bisect_crash
 
 IV = cp.intvar(-2,5)
 BV = cp.boolvar()
-model = cp.Model()
-
+model = TracedModel()  # a cp.Model that remembers where constraints are added
 model.add(IV != 3)
 model.add(BV == True)
 model.add(5 % IV > 2)
@@ -16,4 +16,14 @@ try:
         print("Trying",c)
         cp.Model(c).solve()
 except:
-    print(f"constraint {c} is bugged")
\ No newline at end of file
+    print(f"constraint {c} is bugged")
+
+# Without a solve per constraint: the static checks flag the modulo, whose divisor can be 0
+for c, problem, where in validate(model):
+    print(f"{where}: {problem}")
+
+# errors that only the solver sees (here: a domain too large for OR-Tools) are found by bisection
+big = cp.intvar(0, 2**62, name="big")
+model.add(big + IV == 3)
+for c, error, where in bisect_crash(model):
+    print(f"{where}: constraint {c} is bugged: {error}")
@@ -1,14 +1,17 @@
 import cpmpy as cp
 from cpmpy.tools.explain import mus, mcs, mcs_opt
 import networkx as nx
-import re
+import heapq
+import time
+from provenance import Provenance
 import matplotlib.pyplot as plt
 
 draw = lambda g, **kwargs: (nx.draw_circular(g, width=5, node_size=500, **kwargs), plt.show())
 cmap = ["black", "yellow", "cyan", "lightgreen", "blue"]
+edge_index = Provenance()  # the edge of each constraint and the node of each variable, of all models built below
 
 
-def graph_coloring(graph, max_colors=None):
+def graph_coloring(graph, max_colors=None, provenance=edge_index):
     nodes_num = graph.number_of_nodes()
     max_colors = max_colors if max_colors is not None else nodes_num
 
@@ -16,25 +19,73 @@ def graph_coloring(graph, max_colors=None):
     # variables are the nodes, possible values are the colours
     nodes = cp.intvar(1, max_colors, shape=nodes_num, name="Node")
     # constrain edges to have differently colored nodes (i.e., not equal values)
-    m.add([nodes[n1] != nodes[n2] for n1, n2 in graph.edges()])
+    edge_cons = [nodes[n1] != nodes[n2] for n1, n2 in graph.edges()]
+    m.add(edge_cons)
     m.minimize(cp.max(nodes))  # minimize colours used!
-
+    provenance.add_each(edge_cons, graph.edges())  # to project explanations back onto the graph
+    provenance.add_vars(nodes)
     return m, nodes
 
 
-def graph_highlight(graph, cons, **kwargs):
-    edges = []
-    for c in cons:
-        n1, n2 = c.args
-        if n1.name == "max": continue
-        a = int(re.search("\[[0-9]*\]", str(n1)).group()[1:-1])
-        b = int(re.search("\[[0-9]*\]", str(n2)).group()[1:-1])
-        edges.append((a, b))
-
-    colors = ["red" if (a, b) in edges else "black" for (a, b) in graph.edges()]
+def graph_highlight(graph, cons, provenance=edge_index, **kwargs):
+    # 'provenance' as filled in by graph_coloring, constraints without an edge (e.g. cuts) are ignored
+    conflict = set(provenance.project(cons))
+    colors = ["red" if e in conflict else "black" for e in graph.edges()]
     return draw(graph, edge_color=colors, **kwargs)
 
 
+def dsatur(graph):
+    # DSATUR greedy colouring: colour the node with most differently coloured neighbours first (ties: degree)
+    colour, seen = {}, {n: set() for n in graph}  # seen[n]: colours of n's coloured neighbours
+    heap = [(0, -graph.degree(n), n) for n in graph]
+    heapq.heapify(heap)
+    while len(heap) > 0:
+        sat, _, n = heapq.heappop(heap)
+        if n in colour or -sat != len(seen[n]):
+            continue  # outdated entry
+        colour[n] = min(set(range(len(seen[n]) + 1)) - seen[n])  # smallest free colour, from 0
+        for nb in graph[n]:
+            if nb not in colour and colour[n] not in seen[nb]:
+                seen[nb].add(colour[n])
+                heapq.heappush(heap, (-len(seen[nb]), -graph.degree(nb), nb))
+    return colour
+
+
+def greedy_clique(graph):
+    # grow a clique from each of the highest-degree nodes, always adding the candidate with most neighbours
+    best = []
+    for start in sorted(graph.nodes, key=graph.degree, reverse=True)[:20]:
+        clique, candidates = [start], set(graph[start])
+        while len(candidates) > 0:
+            n = max(candidates, key=lambda c: len(candidates & set(graph[c])))
+            clique.append(n)
+            candidates &= set(graph[n])
+        if len(clique) > len(best):
+            best = clique
+    return best
+
+
+def colouring_bounds(graph):
+    """
+    Preprocessing: DSATUR gives an upper bound and a colouring to use as hint,
+    a large clique gives a lower bound (all its nodes need a different colour).
+    The hint's colours are renumbered so that the clique nodes have colours 1..len(clique).
+    """
+    greedy = dsatur(graph)  # node -> colour, from 0
+    clique = greedy_clique(graph)
+    order = [greedy[n] for n in clique] + sorted(set(greedy.values()) - {greedy[n] for n in clique})
+    renumber = {c: i + 1 for i, c in enumerate(order)}
+    hint = [renumber[greedy[n]] for n in range(graph.number_of_nodes())]
+    return clique, max(hint), hint
+
+
+def graph_coloring_bounded(graph, clique, upper):
+    # domains 1..upper, and the clique's colours fixed to 1..len(clique) (also breaks the value symmetry)
+    m, nodes = graph_coloring(graph, max_colors=upper)
+    m.add([nodes[n] == i + 1 for i, n in enumerate(clique)])
+    return m, nodes
+
+
 G = nx.fast_gnp_random_graph(5, 0.8, seed=0)
 m, nodes = graph_coloring(G, max_colors=3)
 
@@ -43,5 +94,21 @@ if m.solve():
     draw(G, node_color=[cmap[n.value()] for n in nodes])
 else:
     print("No solution found.")
+    # highlight the edges of a minimal conflict, looked up in the provenance index
+    conflict = mus(m.constraints)
+    print("conflicting edges:", edge_index.project(conflict))  # 4 of the nodes form a clique
+    graph_highlight(G, conflict)
 
 
+# Larger graph: preprocessing shrinks the domains from nodes_num to the DSATUR bound
+G = nx.gnp_random_graph(60, 0.3, seed=0)
+t0 = time.perf_counter()
+clique, upper, hint = colouring_bounds(G)
+t1 = time.perf_counter()
+m, nodes = graph_coloring_bounded(G, clique, upper)
+s = cp.SolverLookup.get("ortools", m)
+s.solution_hint(nodes, hint)
+s.solve(time_limit=5)
+t2 = time.perf_counter()
+print(f"bounds [{len(clique)}, {upper}] in {t1 - t0:.3f}s, solved to {s.objective_value()} colours "
+      f"({s.status().exitstatus.name}) in {t2 - t1:.3f}s")
@@ -1,6 +1,6 @@
 import numpy as np
-
 import cpmpy as cp
+from solution_stream import solution_stream, count_solutions
 
 grid = cp.intvar(1,9, shape=(9,9), name="grid")  # Decision variables
 model = cp.Model(
@@ -23,3 +23,11 @@ while model.solve() and solutions < solution_limit:
     model.add(~cp.all(grid == grid.value()))
     # The above is equivalent to
     model.add(cp.any(cell != cell.value() for cell in grid.flatten()))  # flatten grid, otherwise you get just the rows
+
+# The loop above re-posts the whole model at every model.solve(),
+# solution_stream keeps one solver and only adds the blocking clause
+for sol in solution_stream(model, grid[0], solution_limit=solution_limit):  # projected on the first row
+    print(sol)
+
+n_sols, last = count_solutions(model, solution_limit=1000, buffer_size=3)  # native enumeration, keeps only the last 3
+print(f"Counted {n_sols} solutions")
@@ -13,3 +13,13 @@ model.add([S[0]+D[0] <= S[1], S[0]+D[0] <= S[2],
 model.minimize(S[6])
 
 model.solve()
+
+# The same network with each start limited to its time window (longest paths before and after it),
+# instead of 1..sum(D) for all of them. Scales to project networks with thousands of tasks.
+from precedence import precedence_model, time_windows
+
+E = [(0,1), (0,2), (0,3), (1,4), (2,5), (3,4), (4,6), (5,6)]
+print("earliest, latest start:", *time_windows(D, E))
+model2, S2 = precedence_model(D, E)
+model2.solve()
+print("makespan", model.objective_value(), model2.objective_value() + 1)  # model starts at time 1
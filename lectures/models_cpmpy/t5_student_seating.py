@@ -1,4 +1,5 @@
 import cpmpy as cp
+from viewpoints import channel, prune_implied
 
 n_chairs = 20
 n_students = 15
@@ -16,3 +17,11 @@ model.add(cp.AllDifferent(students))
 chairs = cp.intvar(0, n_students, shape=n_chairs)
 model.add(cp.AllDifferentExceptN(chairs, 0))
 
+# Channel the two viewpoints: chairs[c-1] == i+1 <-> students[i] == c, 0 for an empty chair
+model.add(channel(students, chairs, base=1, empty=0))
+model, removed = prune_implied(model, students, chairs, base=1, empty=0)  # both AllDifferents are implied now
+print("implied:", removed)
+
+if model.solve():
+    print("students:", students.value())
+    print("chairs:  ", chairs.value())
@@ -1,25 +1,46 @@
 import os
 import pytest
-import subprocess
+
+from script_runner import run_scripts
 
 # Path to the folder containing the scripts
 SCRIPTS_DIR = '.'
+TIMEOUT = 120  # seconds per script, a hanging script fails instead of blocking the suite
 
 def get_python_scripts(folder):
     """
-    Get a list of all Python scripts in the specified folder, excluding this test script.
+    Get a list of all Python scripts in the specified folder, excluding the tests and the runner.
+    """
+    return [f for f in os.listdir(folder) if f.endswith('.py') and f != "script_runner.py" and not f.startswith("test_")]
+
+@pytest.fixture(scope="module")
+def results(request):
+    """
+    Run the selected scripts (e.g. with -k) once, concurrently, in workers forked from this interpreter.
     """
-    test_script_name = os.path.basename(__file__)
-    return [f for f in os.listdir(folder) if f.endswith('.py') and f != test_script_name]
+    selected = [item.callspec.params["script"] for item in request.session.items
+                if item.module is request.module and "script" in getattr(getattr(item, "callspec", None), "params", {})]
+    scripts = [os.path.join(SCRIPTS_DIR, s) for s in selected]
+    return run_scripts(scripts, timeout=TIMEOUT)
 
 @pytest.mark.parametrize("script", get_python_scripts(SCRIPTS_DIR))
-def test_script_execution(script):
+def test_script_execution(script, results):
     """
     Test that the Python script runs without errors.
     """
-    script_path = os.path.join(SCRIPTS_DIR, script)
-    result = subprocess.run(['python3', script_path], capture_output=True, text=True)
-    assert result.returncode == 0, f"Script {script} failed with error:\n{result.stderr}"
+    result = results[os.path.join(SCRIPTS_DIR, script)]
+    assert result["returncode"] == 0, f"Script {script} failed with error:\n{result['output']}"
+
+def test_failing_script_output(tmp_path):
+    """
+    Test that the traceback of a failing script ends up in its output, also under pytest's capturing.
+    """
+    script = tmp_path / "failing.py"
+    script.write_text("print('before')\nraise ValueError('no solution')\n")
+    result = run_scripts([str(script)], timeout=TIMEOUT)[str(script)]
+    assert result["returncode"] == 1
+    assert "before" in result["output"]
+    assert "ValueError: no solution" in result["output"]
 
 if __name__ == "__main__":
     pytest.main()
@@ -0,0 +1,68 @@
+import itertools
+
+import numpy as np
+import pytest
+import cpmpy as cp
+from cpmpy.expressions.globalconstraints import STAR
+
+from compress_table import short_tuples, table_mdd, compressed_table, shift_table
+
+
+def expand(short, domains):
+    # all the full tuples that the short tuples stand for
+    return {t for row in short for t in itertools.product(*[dom if v is STAR else [v] for v, dom in zip(row, domains)])}
+
+
+def random_table(seed, k=4, d=3):
+    rng = np.random.default_rng(seed)
+    full = np.indices((d,) * k).reshape(k, -1).T
+    return full[rng.random(len(full)) < 0.6], [range(d)] * k
+
+
+def test_short_tuples_cover_the_table():
+    """
+    Test that the short tuples stand for exactly the rows of the table.
+    """
+    for seed in range(10):
+        table, domains = random_table(seed)
+        short = short_tuples(table, domains)
+        assert expand(short, domains) == {tuple(r) for r in table}
+        assert len(short) <= len(table)
+
+
+def test_short_tuples_domains():
+    """
+    Test that a column is only starred when the table covers the domain of the variable, not just its own values.
+    """
+    table = np.array([[0, 0], [0, 1], [1, 0]])
+    assert len(short_tuples(table, [range(2), range(2)])) == 2
+    assert len(short_tuples(table, [range(3), range(3)])) == 3
+    with pytest.raises(ValueError):
+        short_tuples(table, [range(1), range(2)])
+
+
+def test_mdd_paths_are_the_table():
+    """
+    Test that the paths from the root to the sink of the MDD are exactly the rows of the table.
+    """
+    for seed in range(10):
+        table, _ = random_table(seed)
+        transitions = table_mdd(table)
+        paths = {(0, ())}
+        for _ in range(table.shape[1]):
+            paths = {(b, t + (v,)) for node, t in paths for a, v, b in transitions if a == node}
+        assert {t for node, t in paths if node == transitions[-1][2]} == {tuple(r) for r in table}
+
+
+def test_compressed_table_solutions():
+    """
+    Test against the plain table: every form of the constraint has the same solutions.
+    """
+    table = shift_table(4)
+    W = cp.intvar(0, 3, shape=4, name="W")
+    expected = {tuple(r) for r in table}
+    for solver in ["ortools", "pysat"]:
+        con, stats = compressed_table(W, table, solver)
+        found = set()
+        cp.Model(con).solveAll(solver=solver, display=lambda: found.add(tuple(W.value())))
+        assert found == expected, stats["form"]
@@ -0,0 +1,52 @@
+import cpmpy as cp
+
+from incremental import IncrementalModel
+
+
+def test_same_answers_as_a_fresh_model():
+    """
+    Test that adding constraints and swapping the objective gives the optimum of a fresh cp.Model every time.
+    """
+    x = cp.intvar(0, 5, shape=4, name="x")
+    model = IncrementalModel(cp.AllDifferent(x))
+    steps = [(None, cp.sum(x), True), (x[0] + x[1] >= 7, cp.sum(x), True),
+             (None, x[2] - x[3], False), (x[2] <= 3, x[2] - x[3], False), (x[3] >= 2, x[0] * 2 + x[3], True)]
+    for con, objective, is_min in steps:
+        if con is not None:
+            model.add(con)
+        model.minimize(objective) if is_min else model.maximize(objective)
+        fresh = cp.Model(model.constraints)
+        fresh.minimize(objective) if is_min else fresh.maximize(objective)
+        assert model.solve() and fresh.solve()
+        assert model.objective_value() == fresh.objective_value()
+
+
+def test_cached_result():
+    """
+    Test that an unchanged model returns its previous assignment without calling the solver.
+    """
+    x = cp.intvar(0, 5, shape=3, name="x")
+    model = IncrementalModel(cp.sum(x) == 7, x[0] > x[1])
+    assert model.solve()
+    solver, values = model._solver[1], list(x.value())
+    cp.Model(x == 0).solve()  # overwrites the values
+    assert model.solve(time_limit=10)  # another time limit does not invalidate a final result
+    assert model._solver[1] is solver and list(x.value()) == values
+
+    model.add(x[0] == x[1])
+    assert not model.solve()
+    assert model._solver[1] is solver  # only the new constraint was posted
+
+
+def test_assumptions_are_not_cached():
+    """
+    Test that solving under assumptions does not answer later solves, with or without assumptions.
+    """
+    x = cp.intvar(0, 3, name="x")
+    a, b = cp.boolvar(name="a"), cp.boolvar(name="b")
+    model = IncrementalModel(a.implies(x >= 2), b.implies(x <= 1))
+    assert model.solve()
+    assert not model.solve(assumptions=[a, b])
+    assert model.solve(assumptions=[a]) and x.value() >= 2
+    assert model.solve(assumptions=[b]) and x.value() <= 1
+    assert model.solve()
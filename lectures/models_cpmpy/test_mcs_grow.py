@@ -0,0 +1,31 @@
+import itertools
+
+import cpmpy as cp
+
+from mcs_grow import mcs_grow
+
+
+def test_mcs_is_minimal():
+    """
+    Test that removing the MCS leaves a satisfiable set, and that putting back any one of its constraints does not.
+    """
+    x = cp.intvar(0, 3, shape=3, name="x")
+    cons = [x[0] == 1, x[0] == 2, x[1] > x[0], x[1] < 1, x[2] == x[1], x[2] >= 3, cp.sum(x) <= 4]
+    mcs = mcs_grow(cons)
+    rest = [c for c in cons if not any(c is m for m in mcs)]
+    assert len(mcs) > 0 and cp.Model(rest).solve()
+    for c in mcs:
+        assert not cp.Model(rest + [c]).solve()
+
+
+def test_mcs_is_a_complement_of_a_maximal_subset():
+    """
+    Test against brute force: the complement of the MCS is one of the maximal satisfiable subsets.
+    """
+    x = cp.intvar(0, 2, shape=2, name="x")
+    cons = [x[0] == 0, x[0] == 1, x[1] == x[0], x[1] != 0, x[0] + x[1] >= 3]
+    subsets = [set(s) for k in range(len(cons) + 1) for s in itertools.combinations(range(len(cons)), k)
+               if cp.Model([cons[i] for i in s]).solve()]
+    maximal = [s for s in subsets if not any(s < t for t in subsets)]
+    mcs = mcs_grow(cons)
+    assert {i for i, c in enumerate(cons) if not any(c is m for m in mcs)} in maximal
@@ -0,0 +1,44 @@
+import itertools
+
+import numpy as np
+import cpmpy as cp
+
+from mcs_oll import mcs_oll
+
+
+def min_correction_weight(constraints, weights):
+    # brute force: the lightest subset to remove so that the rest is satisfiable
+    n = len(constraints)
+    return min(sum(weights[i] for i in removed)
+               for k in range(n + 1) for removed in itertools.combinations(range(n), k)
+               if cp.Model([c for i, c in enumerate(constraints) if i not in removed]).solve())
+
+
+def test_mcs_oll_is_optimal():
+    """
+    Test against brute force: the correction set has the minimum weight, and removing it leaves a satisfiable set.
+    """
+    rng = np.random.default_rng(0)
+    x = cp.intvar(0, 4, shape=4, name="x")
+    for _ in range(5):
+        preferred = rng.integers(0, 5, size=4)
+        pairs = [(i, j) for i, j in rng.integers(0, 4, size=(5, 2)) if i != j]
+        constraints = [x[i] == preferred[i] for i in range(4)] + [x[i] + 2 <= x[j] for i, j in pairs]
+        weights = [int(w) for w in rng.integers(1, 5, size=len(constraints))]
+        mcs, trace = mcs_oll(constraints, weights)
+        rest = [c for c in constraints if not any(c is m for m in mcs)]
+        assert cp.Model(rest).solve()
+        cost = sum(w for c, w in zip(constraints, weights) if any(c is m for m in mcs))
+        assert cost == trace[-1][1] == trace[-1][2] == min_correction_weight(constraints, weights)
+
+
+def test_mcs_oll_trace():
+    """
+    Test that the lower bounds never decrease and the upper bounds never increase.
+    """
+    x = cp.intvar(0, 3, shape=3, name="x")
+    constraints = [x[0] == 1, x[0] == 2, x[1] > x[0], x[1] < 1, x[2] == x[1], x[2] >= 3, cp.sum(x) <= 4]
+    mcs, trace = mcs_oll(constraints, [3, 1, 2, 2, 1, 3, 1])
+    lbs, ubs = [lb for _, lb, _ in trace], [ub for _, _, ub in trace]
+    assert lbs == sorted(lbs) and ubs == sorted(ubs, reverse=True)
+    assert all(lb <= ub for lb, ub in zip(lbs, ubs))
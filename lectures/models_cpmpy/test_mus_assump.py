@@ -0,0 +1,33 @@
+import cpmpy as cp
+
+from mus_assump import mus_assump, quickxplain_assump
+
+
+def conflicting():
+    x = cp.intvar(0, 3, shape=3, name="x")
+    return [x[0] == 1, x[0] == 2, x[1] > x[0], x[1] < 1, x[2] == x[1], x[2] >= 3, cp.sum(x) <= 4]
+
+
+def is_sat(constraints):
+    return cp.Model(constraints).solve()
+
+
+def test_mus_is_minimal():
+    """
+    Test that the MUS is unsatisfiable and that dropping any one of its constraints makes it satisfiable.
+    """
+    for find in (mus_assump, quickxplain_assump):
+        core = find(conflicting())
+        assert len(core) > 0 and not is_sat(core)
+        for i in range(len(core)):
+            assert is_sat(core[:i] + core[i + 1:])
+
+
+def test_mus_exact():
+    """
+    Test that the only conflict is found, also with a group of constraints as one element.
+    """
+    x, y = cp.intvar(0, 3, name="x"), cp.intvar(0, 3, name="y")
+    cons = [y == 0, x == 1, [x >= 2, y <= 1], y >= 0]
+    for find in (mus_assump, quickxplain_assump):
+        assert [str(c) for c in find(cons)] == [str(cons[1]), str(cons[2])]
@@ -0,0 +1,56 @@
+import re
+import itertools
+
+import pytest
+import cpmpy as cp
+
+from regular import regex_dfa, minimise, regular
+
+alphabet = "ABC"
+patterns = ["A*B", "(AB|C)*", "[^A]+A?", "A{2}.", "(A|BC){1,}", "B{0,2}C{2,}", ".*AB.*", "(A|B)?C{1,3}"]
+
+
+def accepts(dfa, word):
+    transitions, state, accepting = dfa
+    delta = {(s, v): t for s, v, t in transitions}
+    for ch in word:
+        state = delta.get((state, alphabet.index(ch)))
+        if state is None:
+            return False
+    return state in accepting
+
+
+def words(n):
+    return ("".join(w) for w in itertools.product(alphabet, repeat=n))
+
+
+def test_regex_dfa_against_re():
+    """
+    Test that the DFA accepts exactly the words that Python's re matches, up to length 5, and is minimal.
+    """
+    for pattern in patterns:
+        dfa = regex_dfa(pattern, alphabet)
+        for n in range(6):
+            for word in words(n):
+                assert accepts(dfa, word) == (re.fullmatch(pattern, word) is not None), (pattern, word)
+        assert minimise(dfa) == dfa  # nothing left to merge or drop
+
+
+def test_regex_dfa_invalid():
+    for pattern in ["A{3,1}", "A{", "(AB", "A{,2}"]:
+        with pytest.raises(ValueError):
+            regex_dfa(pattern, alphabet)
+
+
+@pytest.mark.parametrize("form", ["regular", "table", "layered"])
+def test_regular_forms(form):
+    """
+    Test that every form of the constraint has the accepted words of length 4 as its solutions, row by row.
+    """
+    X = cp.intvar(0, 2, shape=(2, 4), name="X")
+    for pattern in patterns:
+        expected = {w for w in words(4) if re.fullmatch(pattern, w)}
+        model = cp.Model(regular(X, regex_dfa(pattern, alphabet), form=form), X[0] == X[1])
+        found = set()
+        model.solveAll(display=lambda: found.add("".join(alphabet[v] for v in X.value()[0])))
+        assert found == expected, pattern
@@ -0,0 +1,73 @@
+import itertools
+
+import pytest
+import cpmpy as cp
+from cpmpy.exceptions import NotSupportedError
+from cpmpy.expressions.utils import flatlist
+from cpmpy.transformations.get_variables import get_variables
+
+from sat_encoding import CNF, encodings
+
+
+def all_solutions(cnf, variables):
+    # enumerate the solutions of the CNF with blocking clauses on the encodings of 'variables'
+    from pysat.solvers import Solver
+    found = set()
+    with Solver(bootstrap_with=cnf.clauses) as s:
+        while s.solve():
+            model = s.get_model()
+            values = tuple(cnf.value(x, model) for x in variables)
+            found.add(values)
+            s.add_clause([-lit for x, v in zip(variables, values) for lit in cnf.eq(x, v)])
+    return found
+
+
+def brute_force(constraints, variables):
+    found = set()
+    for values in itertools.product(*[range(x.lb, x.ub + 1) for x in variables]):
+        for x, v in zip(variables, values):
+            x._value = v
+        if all(c.value() for c in flatlist(constraints)):
+            found.add(values)
+    return found
+
+
+def test_encodings_against_brute_force():
+    """
+    Test that every encoding has exactly the solutions of the constraints, for each supported kind of constraint.
+    """
+    x, y, z = cp.intvar(-1, 3, name="x"), cp.intvar(0, 4, name="y"), cp.intvar(1, 2, name="z")
+    cases = [
+        [cp.AllDifferent([x, y, z])],
+        [cp.AllDifferent([x, y + 1, z - 2])],
+        [x != y + 2, y != 3],
+        [x - y != 1, y - z != 0, -x + z != 1, x - 1 != y + 1],
+        [x == y - 1, y != z],
+        [x < y, y <= z + 1],
+        [x + 2 * y - z >= 4, x + y + z <= 6],
+        [cp.sum([x, y, z]) == 5],
+        [cp.cpm_array([3, 1, 0, 2])[z] == y, x != y],
+    ]
+    for cons in cases:
+        variables = get_variables(cons)
+        expected = brute_force(cons, variables)
+        for encoding in ("auto",) + encodings:
+            assert all_solutions(CNF(cons, encoding), variables) == expected, (cons, encoding)
+
+
+def test_status():
+    """
+    Test that solve() reports an unsatisfiable CNF as such, and writes a solution back otherwise.
+    """
+    x = cp.intvar(0, 3, shape=3, name="x")
+    cnf = CNF([cp.AllDifferent(x), cp.sum(x) <= 2])
+    assert not cnf.solve() and cnf.status().exitstatus.name == "UNSATISFIABLE"
+    cnf = CNF([cp.AllDifferent(x), cp.sum(x) <= 3])
+    assert cnf.solve() and cnf.status().exitstatus.name == "FEASIBLE"
+    assert sorted(x.value()) == [0, 1, 2]
+
+
+def test_not_supported():
+    x, y = cp.intvar(0, 3, name="x"), cp.intvar(0, 3, name="y")
+    with pytest.raises(NotSupportedError):
+        CNF([x + y != 2])
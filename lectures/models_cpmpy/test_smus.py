@@ -0,0 +1,35 @@
+import itertools
+
+import numpy as np
+import cpmpy as cp
+
+from smus import ExplanationSession
+
+
+def smallest_mus_size(soft, hard):
+    # brute force: the size of the smallest unsatisfiable subset
+    for k in range(1, len(soft) + 1):
+        if any(not cp.Model(hard, list(s)).solve() for s in itertools.combinations(soft, k)):
+            return k
+
+
+def test_session_against_brute_force():
+    """
+    Test that every query of a session, with overlapping soft sets, gets a MUS of the smallest size.
+    """
+    rng = np.random.default_rng(0)
+    x = cp.intvar(0, 3, shape=4, name="x")
+    hard = [cp.sum(x) <= 7]
+    pool = [x[i] == v for i in range(4) for v in (0, 3)] + [x[i] < x[j] for i, j in itertools.permutations(range(4), 2)]
+    session = ExplanationSession(hard)
+    queries = 0
+    while queries < 8:
+        soft = [pool[i] for i in sorted(rng.choice(len(pool), size=8, replace=False))]
+        if cp.Model(hard, soft).solve():
+            continue
+        queries += 1
+        mus = session.smus(soft)
+        assert all(any(c is s for s in soft) for c in mus)
+        assert not cp.Model(hard, mus).solve()
+        assert all(cp.Model(hard, mus[:i] + mus[i + 1:]).solve() for i in range(len(mus)))
+        assert len(mus) == smallest_mus_size(soft, hard)
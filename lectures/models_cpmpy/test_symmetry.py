@@ -0,0 +1,62 @@
+import cpmpy as cp
+
+from symmetry import symmetry_breaking
+
+
+def solutions(model, x):
+    found = set()
+    model.solveAll(display=lambda: found.add(tuple(x.value())))
+    return found
+
+
+def image(g, solution):
+    # the solution with the variables and values moved by generator g
+    values = {a[1]: b[1] for a, b in g.items() if a[0] == "value"}
+    moved = list(solution)
+    for i, v in enumerate(solution):
+        j = g.get(("var", i), ("var", i))[1]
+        moved[j] = values.get(v, v)
+    return tuple(moved)
+
+
+def orbit(solution, generators):
+    seen, todo = {solution}, [solution]
+    while len(todo) > 0:
+        s = todo.pop()
+        for g in generators:
+            t = image(g, s)
+            if t not in seen:
+                seen.add(t)
+                todo.append(t)
+    return seen
+
+
+def check(model, x):
+    all_solutions = solutions(model, x)
+    cons, generators = symmetry_breaking(model)
+    assert len(generators) > 0
+    for g in generators:  # every generator maps solutions to solutions
+        assert all(image(g, s) in all_solutions for s in all_solutions)
+    kept = solutions(cp.Model(model.constraints, cons), x)
+    assert kept <= all_solutions
+    for s in all_solutions:  # every class of symmetric solutions keeps at least one of them
+        assert not orbit(s, generators).isdisjoint(kept)
+    return all_solutions, kept
+
+
+def test_colouring_cycle():
+    """
+    Test on a graph colouring of a 4-cycle, with both variable and value symmetries, against all its solutions.
+    """
+    x = cp.intvar(0, 2, shape=4, name="x")
+    all_solutions, kept = check(cp.Model([x[i] != x[(i + 1) % 4] for i in range(4)]), x)
+    assert len(kept) < len(all_solutions)
+
+
+def test_interchangeable_variables():
+    """
+    Test on a sum over interchangeable variables (no value symmetry), against all its solutions.
+    """
+    x = cp.intvar(0, 3, shape=3, name="x")
+    all_solutions, kept = check(cp.Model(cp.sum(x) == 4), x)
+    assert kept == {s for s in all_solutions if list(s) == sorted(s)}
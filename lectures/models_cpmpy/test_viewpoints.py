@@ -0,0 +1,59 @@
+import itertools
+
+import pytest
+import cpmpy as cp
+
+from viewpoints import channel, dual_viewpoint, prune_implied
+
+
+def solutions(constraints, *arrays):
+    found = set()
+    cp.Model(constraints).solveAll(display=lambda: found.add(tuple(tuple(a.value()) for a in arrays)))
+    return found
+
+
+def brute_force(n, lb, n_values, base, empty):
+    # all injective assignments of n variables to the values lb.., with the dual: the variable per value or empty
+    found = set()
+    for primal in itertools.permutations(range(lb, lb + n_values), n):
+        dual = [empty] * n_values
+        for i, v in enumerate(primal):
+            dual[v - lb] = base + i
+        found.add((primal, tuple(dual)))
+    return found
+
+
+def test_channel_total():
+    """
+    Test against brute force: a total channelling (Inverse, also shifted) has exactly the permutations.
+    """
+    for lb, base in [(0, 0), (1, 0), (0, 1), (3, 2)]:
+        primal = cp.intvar(lb, lb + 3, shape=4, name="primal")
+        dual = cp.intvar(base, base + 3, shape=4, name="dual")
+        cons = channel(primal, dual, base)
+        assert isinstance(cons[0], cp.Inverse)
+        assert solutions(cons, primal, dual) == brute_force(4, lb, 4, base, None)
+
+
+def test_channel_partial():
+    """
+    Test against brute force: a partial channelling has the injective assignments, with 'empty' for the free values.
+    """
+    primal = cp.intvar(1, 5, shape=3, name="primal")
+    dual, cons = dual_viewpoint(primal, base=1, empty=0)
+    assert solutions(cons, primal, dual) == brute_force(3, 1, 5, 1, 0)
+
+
+def test_prune_implied():
+    """
+    Test that the implied AllDifferents are removed without changing the solutions, and only with the channelling.
+    """
+    primal = cp.intvar(1, 5, shape=3, name="primal")
+    dual = cp.intvar(0, 3, shape=5, name="dual")
+    alldiff = [cp.AllDifferent(primal), cp.AllDifferentExceptN(dual, 0), primal[0] < primal[1]]
+    model = cp.Model(alldiff, channel(primal, dual, base=1, empty=0))
+    pruned, removed = prune_implied(model, primal, dual, base=1, empty=0)
+    assert [str(c) for c in removed] == [str(c) for c in alldiff[:2]]
+    assert solutions(pruned.constraints, primal, dual) == solutions(model.constraints, primal, dual)
+    with pytest.raises(ValueError):
+        prune_implied(cp.Model(alldiff), primal, dual, base=1, empty=0)
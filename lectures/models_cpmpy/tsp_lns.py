@@ -0,0 +1,97 @@
+import time
+
+import numpy as np
+import cpmpy as cp
+
+
+def nearest_neighbour(distance, start=0):
+    # greedy construction: always travel to the closest unvisited city, returns the successor array
+    n = len(distance)
+    tour, visited = [start], {start}
+    while len(tour) < n:
+        last = tour[-1]
+        nxt = min((c for c in range(n) if c not in visited), key=lambda c: distance[last, c])
+        tour.append(nxt)
+        visited.add(nxt)
+    succ = np.empty(n, dtype=int)
+    succ[tour] = np.roll(tour, -1)
+    return succ
+
+
+def tour_length(distance, succ):
+    return int(sum(distance[c, succ[c]] for c in range(len(succ))))
+
+
+# neighbourhoods: which cities get a free successor, given the current tour
+def random_neighbourhood(distance, succ, k, rng):
+    return rng.choice(len(succ), size=k, replace=False)
+
+
+def segment_neighbourhood(distance, succ, k, rng):
+    city, segment = rng.integers(len(succ)), []
+    for _ in range(k):  # k consecutive cities along the tour
+        segment.append(city)
+        city = succ[city]
+    return np.array(segment)
+
+
+def distance_neighbourhood(distance, succ, k, rng):
+    return np.argsort(distance[rng.integers(len(succ))])[:k]  # a random city and its k-1 closest ones
+
+
+neighbourhoods = dict(random=random_neighbourhood, segment=segment_neighbourhood, distance=distance_neighbourhood)
+
+
+def tsp_lns(distance, time_limit=10, k=10, iteration_time=1, neighbourhood="random", solver="ortools", seed=0):
+    """
+    Large-neighbourhood search for the TSP on one persistent solver.
+
+    Starts from the nearest-neighbour tour, given as solution hint. Every iteration keeps all but
+    'k' cities fixed to their current successor (through assumptions) and re-optimises the others
+    within 'iteration_time' seconds; improving tours are kept.
+    'neighbourhood' is one of 'random', 'segment', 'distance', or 'mix' to alternate between them.
+
+    Returns the best successor array and the anytime trace, a list of (seconds, tour length).
+    """
+    distance = np.asarray(distance)
+    n = len(distance)
+    k = min(k, n)
+    rng = np.random.default_rng(seed)
+    t0 = time.perf_counter()
+
+    Next = cp.intvar(0, n - 1, shape=n, name="Next")
+    arc = cp.boolvar(shape=(n, n), name="arc")  # arc[i,j] <-> Next[i] == j
+    s = cp.SolverLookup.get(solver)
+    s += cp.Circuit(Next)
+    s += [arc[i, j] == (Next[i] == j) for i in range(n) for j in range(n)]
+    s.minimize(cp.sum(distance * arc))
+
+    best = nearest_neighbour(distance)
+    trace = [(time.perf_counter() - t0, tour_length(distance, best))]
+
+    names = list(neighbourhoods) if neighbourhood == "mix" else [neighbourhood]
+    it = 0
+    while time.perf_counter() - t0 < time_limit:
+        free = set(neighbourhoods[names[it % len(names)]](distance, best, k, rng).tolist())
+        it += 1
+        fixed = [arc[c, best[c]] for c in range(n) if c not in free]
+        s.solution_hint(Next, best)
+        remaining = time_limit - (time.perf_counter() - t0)
+        if remaining <= 0:  # the neighbourhood used up the rest of the budget
+            break
+        if s.solve(assumptions=fixed, time_limit=min(iteration_time, remaining)):
+            length = tour_length(distance, Next.value())
+            if length < trace[-1][1]:
+                best = Next.value()
+                trace.append((time.perf_counter() - t0, length))
+    return best, trace
+
+
+if __name__ == "__main__":
+    from instances import tsp_distances
+
+    distance = tsp_distances(40, seed=1)
+    print("nearest neighbour:", tour_length(distance, nearest_neighbour(distance)))
+    for neighbourhood in ["random", "segment", "distance", "mix"]:
+        best, trace = tsp_lns(distance, time_limit=1, k=8, iteration_time=0.2, neighbourhood=neighbourhood)
+        print(f"{neighbourhood:9s} best {trace[-1][1]}, trace:", " ".join(f"{t:.2f}s:{v}" for t, v in trace))
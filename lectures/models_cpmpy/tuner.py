@@ -0,0 +1,201 @@
+import os
+import json
+import time
+import random
+import hashlib
+import itertools
+import multiprocessing as mp
+from multiprocessing.connection import wait
+
+import pandas as pd
+import cpmpy as cp
+from cpmpy.solvers.solver_interface import ExitStatus
+
+
+def model_hash(model, solver):
+    # same printed model and same solver: same cache entries
+    return hashlib.sha1(f"{solver}\n{model}".encode()).hexdigest()
+
+
+class TrialCache:
+    """
+    On-disk cache of (model hash, parameters, time limit) -> runtime, stored as a json file.
+    Runs that were capped are stored as well, they are a lower bound on the runtime.
+    """
+
+    def __init__(self, fname="tuner_cache.json"):
+        self.fname = fname
+        self.data = {}
+        if fname is not None and os.path.exists(fname):
+            with open(fname) as f:
+                self.data = json.load(f)
+
+    @staticmethod
+    def key(params, time_limit):
+        return json.dumps(dict(params=params, time_limit=time_limit), sort_keys=True)
+
+    def get(self, mhash, params, time_limit, cap):
+        entry = self.data.get(mhash, {}).get(self.key(params, time_limit))
+        if entry is None:
+            return None
+        if entry["status"] == "CAPPED" and entry["runtime"] < cap:
+            return None  # only know it is slower than a smaller cap, need to re-run
+        return entry
+
+    def put(self, mhash, params, time_limit, status, runtime):
+        self.data.setdefault(mhash, {})[self.key(params, time_limit)] = dict(status=status, runtime=runtime)
+        if self.fname is not None:
+            with open(self.fname, "w") as f:
+                json.dump(self.data, f)
+
+
+def _solve(model, solver, params, time_limit, conn):
+    # runs in a worker process, sends its result over its own pipe (see portfolio.py)
+    try:
+        s = cp.SolverLookup.get(solver, model)
+        s.solve(time_limit=time_limit, **params)
+        status = s.status().exitstatus
+        # FEASIBLE is a finished run for a satisfaction problem, but for an optimisation problem it means
+        # that the time limit was hit before optimality was proven
+        finished = [ExitStatus.OPTIMAL, ExitStatus.UNSATISFIABLE] + ([] if model.has_objective() else [ExitStatus.FEASIBLE])
+        if status in finished:
+            conn.send((status.name, s.status().runtime))
+        else:
+            conn.send(("CAPPED", time_limit))  # ran into the time limit
+    except Exception as e:  # e.g. an unknown or invalid solver parameter
+        conn.send((f"ERROR: {type(e).__name__}", None))
+    conn.close()
+
+
+def evaluate(model, solver, configurations, time_limit=20, n_jobs=None, cache="tuner_cache.json", verbose=True):
+    """
+    Evaluate a list of parameter dictionaries on a pool of 'n_jobs' worker processes.
+
+    Racing with adaptive capping: every run is capped at the runtime of the best configuration so far,
+    runs that are still going when a faster configuration finishes are killed as soon as they exceed it.
+    Measured runtimes are stored in the on-disk 'cache' (None to disable), so configurations
+    that were already measured on the same model are not run again. Runs that raised an error
+    get status "ERROR: <exception>" and no runtime, and are not cached.
+
+    Returns the best parameters and the trial log as a pandas DataFrame.
+    """
+    n_jobs = n_jobs or os.cpu_count()
+    cache = TrialCache(cache)
+    mhash = model_hash(model, solver)
+
+    best_runtime, best_idx = float(time_limit), None
+    trials = []
+    running = {}  # idx -> (process, receiving end of its pipe, start time)
+    todo = list(enumerate(configurations))
+
+    def record(idx, status, runtime, cached=False):
+        nonlocal best_runtime, best_idx
+        params = configurations[idx]
+        trials.append(dict(params, status=status, runtime=runtime, cached=cached))
+        if status.startswith("ERROR"):
+            if verbose:
+                print(params, "->", status, flush=True)
+            return
+        if not cached:
+            cache.put(mhash, params, time_limit, status, runtime)
+        if status != "CAPPED" and runtime < best_runtime:
+            best_runtime, best_idx = runtime, idx
+        if verbose:
+            mark = " (best)" if best_idx == idx else ""
+            print(params, "->", status, f"{runtime:.3f}", "[cached]" if cached else "", mark, flush=True)
+
+    while len(todo) > 0 or len(running) > 0:
+        while len(todo) > 0 and len(running) < n_jobs:
+            idx, params = todo.pop(0)
+            entry = cache.get(mhash, params, time_limit, best_runtime)
+            if entry is not None:
+                record(idx, entry["status"], entry["runtime"], cached=True)
+                continue
+            recv, send = mp.Pipe(duplex=False)
+            p = mp.Process(target=_solve, args=(model, solver, params, best_runtime, send), daemon=True)
+            p.start()
+            send.close()  # only the worker writes
+            running[idx] = (p, recv, time.time())
+
+        ready = wait([recv for _, recv, _ in running.values()], timeout=0.05)
+        for idx, (p, recv, start) in list(running.items()):
+            if recv not in ready:
+                continue
+            try:
+                status, runtime = recv.recv()
+            except EOFError:  # the worker died without sending a result
+                status, runtime = f"ERROR: exit code {p.exitcode}", None
+            del running[idx]
+            recv.close()
+            p.join()
+            record(idx, status, runtime)
+
+        # racing: kill the runs that already took longer than the incumbent
+        for idx, (p, recv, start) in list(running.items()):
+            if time.time() - start > best_runtime + 1:  # + 1s for process and model start-up
+                p.kill()
+                p.join()
+                recv.close()
+                del running[idx]
+                record(idx, "CAPPED", best_runtime)
+
+    best = configurations[best_idx] if best_idx is not None else None
+    return best, pd.DataFrame(trials)
+
+
+def grid_search(model, solver, space, N=10, **kwargs):
+    # the first N combinations of the search space, in order
+    combinations = [dict(zip(space.keys(), values)) for values in itertools.product(*space.values())]
+    return evaluate(model, solver, combinations[:N], **kwargs)
+
+
+def random_search(model, solver, space, N=10, seed=None, **kwargs):
+    # N different random combinations of the search space
+    combinations = [dict(zip(space.keys(), values)) for values in itertools.product(*space.values())]
+    random.Random(seed).shuffle(combinations)
+    return evaluate(model, solver, combinations[:N], **kwargs)
+
+
+def hyperopt_search(model, solver, space, N=10, time_limit=20, **kwargs):
+    # model-based search with HyperOpt, sequential by nature so one configuration at a time (n_jobs=1)
+    from hyperopt import hp, tpe, fmin, Trials, STATUS_OK, STATUS_FAIL  # optional dependency
+    from hyperopt.exceptions import AllTrialsFailed
+
+    h_space = {k: hp.choice(k, v) for k, v in space.items()}
+    logs = []
+    best = (float("inf"), None)
+
+    def objective(params):
+        nonlocal best
+        cap = min(time_limit, best[0])  # adaptive capping
+        _, df = evaluate(model, solver, [params], time_limit=cap, n_jobs=1, **kwargs)
+        logs.append(df)
+        status = df["status"].iloc[0]
+        if status.startswith("ERROR"):
+            return dict(status=STATUS_FAIL)
+        runtime = float(df["runtime"].iloc[0])
+        if status != "CAPPED" and runtime < best[0]:
+            best = (runtime, params)
+        return dict(loss=runtime, status=STATUS_OK)
+
+    try:
+        fmin(fn=objective, space=h_space, algo=tpe.suggest, trials=Trials(), max_evals=N, show_progressbar=False)
+    except AllTrialsFailed:  # every configuration errored, best stays None
+        pass
+    return best[1], pd.concat(logs, ignore_index=True)
+
+
+if __name__ == "__main__":
+    N = 12
+    queens = cp.intvar(1, N, shape=N, name="queens")
+    model = cp.Model(cp.AllDifferent(queens),
+                     cp.AllDifferent([queens[i] + i for i in range(N)]),
+                     cp.AllDifferent([queens[i] - i for i in range(N)]))
+
+    space = {
+        'cp_model_probing_level': [0, 1, 2, 3],
+        'search_branching': [0, 1, 2],
+        'use_phase_saving': [False, True],
+    }
+    best, trials = random_search(model, "ortools", space, N=6, seed=0, n_jobs=2, time_limit=5, cache=None)
+    print("BEST:", best)
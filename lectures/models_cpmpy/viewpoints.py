@@ -0,0 +1,90 @@
+import numpy as np
+import cpmpy as cp
+from cpmpy.expressions.globalconstraints import AllDifferent, AllDifferentExceptN
+from cpmpy.expressions.utils import flatlist
+
+
+def channel(primal, dual, base=0, empty=None):
+    """
+    Channelling constraints between two viewpoints of an assignment: primal[i] == v <-> dual[v - lb] == base + i,
+    with lb the smallest value of the primal variables. So dual has one variable per primal value,
+    and the primal variables are numbered from 'base' in it.
+
+    When there are more values than primal variables, the assignment is partial: the dual variables
+    of the values nobody takes are 'empty' (as the 0 "empty chair" of t5_student_seating.py).
+    The total case is the Inverse global constraint (over primal - lb and dual - base), the partial case
+    one reified equality per (variable, value) pair.
+    """
+    primal, dual = cp.cpm_array(primal).reshape(-1), cp.cpm_array(dual).reshape(-1)
+    lb = min(x.lb for x in primal)
+    assert len(dual) >= len(primal), "The dual needs a variable per value, at least as many as there are primal variables"
+    assert empty is not None or len(dual) == len(primal), "A partial assignment needs an 'empty' value in the dual"
+    assert empty is None or not base <= empty < base + len(primal), "'empty' can not be the number of a primal variable"
+    if empty is None:
+        return [cp.Inverse(primal - lb if lb != 0 else primal, dual - base if base != 0 else dual)]
+    cons = [(x == lb + v) == (y == base + i) for i, x in enumerate(primal) for v, y in enumerate(dual)]
+    if empty is not None:  # the dual variable of a value nobody takes is 'empty', not any other unchannelled value
+        cons += [(y == empty) == ~cp.any([x == lb + v for x in primal]) for v, y in enumerate(dual)]
+    return cons
+
+
+def dual_viewpoint(primal, base=0, empty=None, name="dual"):
+    """
+    The dual of an assignment 'primal' (see channel()): a new variable per primal value whose value is the primal
+    variable that takes it (numbered from 'base'), or 'empty' when none does.
+    Returns (dual, channelling constraints).
+    """
+    primal = cp.cpm_array(primal).reshape(-1)
+    lb, ub = min(x.lb for x in primal), max(x.ub for x in primal)
+    values = [base, base + len(primal) - 1] + ([empty] if empty is not None else [])
+    dual = cp.intvar(min(values), max(values), shape=(ub - lb + 1,), name=name)
+    return dual, channel(primal, dual, base, empty)
+
+
+def prune_implied(model, primal, dual, base=0, empty=None):
+    """
+    Remove the constraints that the channelling between 'primal' and 'dual' already implies: an AllDifferent over
+    the primal variables (each dual variable takes one value), an AllDifferent(ExceptN) over the dual variables
+    (each primal variable takes one value) and duplicates of earlier constraints.
+    The model must contain the channelling constraints of channel(primal, dual, base, empty), else ValueError.
+    Returns (a new model with the same objective, the removed constraints).
+    """
+    posted = {str(c) for c in flatlist(model.constraints)}
+    if not all(str(c) in posted for c in channel(primal, dual, base, empty)):
+        raise ValueError("The model does not channel the primal and dual viewpoints, their AllDifferents are not implied")
+    primal_ids = {id(x) for x in flatlist(primal)}
+    dual_ids = {id(y) for y in flatlist(dual)}
+
+    def implied(c):
+        if type(c) is AllDifferent:
+            scope = {id(x) for x in flatlist(c.args)}
+            return scope == primal_ids or (scope == dual_ids and empty is None)
+        if isinstance(c, AllDifferentExceptN):
+            return {id(x) for x in flatlist(c.args[0])} == dual_ids and flatlist(c.args[1]) == [empty]
+        return False
+
+    kept, removed, seen = [], [], set()
+    for c in flatlist(model.constraints):
+        if implied(c) or str(c) in seen:
+            removed.append(c)
+        else:
+            kept.append(c)
+            seen.add(str(c))
+    pruned = cp.Model(kept)
+    if model.objective_ is not None:
+        pruned.objective(model.objective_, minimize=model.objective_is_min)
+    return pruned, removed
+
+
+if __name__ == "__main__":
+    # t5_student_seating.py: chair per student, and student per chair (0 is an empty chair)
+    students = cp.intvar(1, 8, shape=5, name="students")
+    chairs, channelling = dual_viewpoint(students, base=1, empty=0, name="chairs")
+    model = cp.Model(cp.AllDifferent(students), cp.AllDifferentExceptN(chairs, 0), channelling,
+                     students[0] == 3, chairs[0] == 2)
+    model, removed = prune_implied(model, students, chairs, base=1, empty=0)
+    print("removed:", removed)
+    assert model.solve()
+    print(students.value(), chairs.value())
+    assert all(chairs[c - 1].value() == i + 1 for i, c in enumerate(students.value()))
+    assert np.count_nonzero(chairs.value()) == len(students)